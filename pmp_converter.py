@@ -4,16 +4,56 @@ PenguinMod File Converter - Main Application
 Unpacks and repacks .pmp files with multiple GitHub-compatible formats
 """
 
+import os
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk
 import threading
 import queue
+import time
+import collections
+import logging
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 
-from pmp_core import PMPConverter
 from pmp_types import ConverterType
-from pmp_logger import LogEntry, LogFilter, LogLevel
+from pmp_logger import LogEntry, LogFilter, LogLevel, STDLIB_LEVELS
+
+
+class TkLogHandler(logging.Handler):
+    """Turns queued log records into LogEntry objects for the GUI thread"""
+    
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        
+    def emit(self, record):
+        """Hand the entry to the GUI queue and wake the log processor"""
+        app = self.app
+        if app._closing:
+            return
+            
+        try:
+            entry = LogEntry(
+                record.pmp_level,
+                record.pmp_source,
+                record.getMessage(),
+                record.created
+            )
+            # Decide visibility here so the UI thread skips hidden entries
+            # cheaply; their line is formatted later if a refresh needs it
+            entry.show = app.log_filter.is_enabled(entry.level)
+            if entry.show:
+                entry.display_line = app.format_log_line(entry)
+            app.log_queue.put(entry)
+            
+            # Wake the UI thread once per batch; process_logs clears the flag
+            if not app._log_pending:
+                app._log_pending = True
+                app.root.event_generate("<<LogArrived>>", when="tail")
+        except Exception:
+            self.handleError(record)
 
 
 class PMPConverterGUI:
@@ -32,6 +72,18 @@ class PMPConverterGUI:
         'info': '#569cd6',
     }
     
+    # Default maximum number of log entries (and console lines) kept in
+    # memory; overridden by the 'log_capacity' setting
+    DEFAULT_LOG_CAPACITY = 5000
+    
+    # Seconds between folder scans when watching a network share
+    DEFAULT_WATCH_INTERVAL = 30
+    
+    # Quiet period after the last watched change before converting
+    WATCH_DEBOUNCE_SEC = 0.5
+    # How long to wait for a finished worker task's last events to be relayed
+    POOL_EVENTS_TIMEOUT_SEC = 5.0
+    
     # Emoji mapping for log levels
     EMOJI_MAP = {
         LogLevel.INFO: 'ℹ️',
@@ -44,28 +96,94 @@ class PMPConverterGUI:
     
     def __init__(self, root):
         self.root = root
+        # Stay unmapped while the widgets are built so layout runs only once
+        self.root.withdraw()
         self.root.title("🐧 PenguinMod File Converter")
         self.root.geometry("1280x720")
         self.root.minsize(1000, 600)
         
-        # Configure dark theme
-        self.root.configure(bg=self.COLORS['bg_dark'])
-        
         # Initialize components
-        self.converter = PMPConverter()
-        self.log_queue = queue.Queue()
-        self.log_entries = []
+        self._converter = None  # Created on first use, see the converter property
+        self.log_queue = queue.SimpleQueue()
+        self._log_capacity = self.DEFAULT_LOG_CAPACITY
+        self.log_entries = collections.deque(maxlen=self._log_capacity)
         self.log_filter = LogFilter()
+        # Keep entries of hidden levels too, so they can be exported or
+        # shown again later ('capture_all_logs' setting). Off by default so
+        # hidden levels cost nothing
+        self.capture_all = False
+        self._closing = False
+        
+        # Emoji and tag lookups indexed by LogLevel.value for the display path
+        size = max(level.value for level in LogLevel) + 1
+        self._emoji_by_val = ['•'] * size
+        self._tag_by_val = [None] * size
+        for level in LogLevel:
+            self._emoji_by_val[level.value] = self.EMOJI_MAP.get(level, '•')
+            self._tag_by_val[level.value] = level.name
+        self._ui_q = queue.SimpleQueue()
+        self._ui_pending = False
+        self._settings_dirty_after = None  # Pending debounced save, if any
+        self._settings_snapshot = None
+        self._settings_cache = None  # (st_mtime_ns, st_size, settings) of the last load
+        self._watcher = None  # Source folder watcher, see update_folder_watcher
+        self._repack_in_flight = False  # An auto-convert run is in progress
+        self._repack_rerun = False  # Changes arrived during that run
+        self._manual_in_flight = False  # A manual unpack or repack is running
+        self._debounce_timer = None
+        # Guards the three flags above and the debounce timer swap, which the
+        # UI, auto-convert and watcher threads all touch
+        self._autoconvert_lock = threading.Lock()
+        self._watchdog_note_shown = False
+        self._pool = None  # Repack worker process, see _get_repack_pool
+        self._pool_events = None
+        self._pool_task_id = 0  # Latest task submitted to the pool
+        self._pool_task_done = threading.Event()  # Its "end" event was relayed
+        self._settings_lock = threading.Lock()
+        
+        # Start with a drain "pending" so nothing raises events from other
+        # threads before mainloop is running; the idle drain (scheduled
+        # once the window is shown) clears it
+        self._log_pending = True
+        
+        # Producers only pay a queue put; the listener thread feeds the GUI
+        self._log_q = queue.SimpleQueue()
+        self._logger = logging.getLogger("pmp_converter.gui")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._logger.handlers = [QueueHandler(self._log_q)]
+        self._log_listener = QueueListener(self._log_q, TkLogHandler(self))
+        self._log_listener.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Build UI
         self.setup_ui()
         
-        # Start log processor
-        self.process_logs()
+        # Configure dark theme
+        self.root.configure(bg=self.COLORS['bg_dark'])
         
-        # Load settings and perform auto-convert if enabled
-        self.load_settings()
-        self.root.after(500, self.check_autoconvert_on_startup)
+        # Lay everything out in one pass, then show the window
+        self.root.update_idletasks()
+        self.root.deiconify()
+        self.root.after_idle(self.process_logs)
+        
+        # Log processor runs whenever producers signal new entries
+        self.root.bind("<<LogArrived>>", lambda e: self.process_logs())
+        self.root.bind("<<UIUpdate>>", lambda e: self.process_ui_updates())
+        
+        # Load settings after the first paint; auto-convert starts once the
+        # window is first mapped
+        self.root.after_idle(self.load_settings)
+        self._first_map_done = False
+        self._map_bind_id = self.root.bind("<Map>", self._on_first_map, add="+")
+        
+    @property
+    def converter(self):
+        """Core converter, imported and created the first time it is needed"""
+        if self._converter is None:
+            from pmp_core import PMPConverter
+            self._converter = PMPConverter()
+        return self._converter
         
     def setup_ui(self):
         """Build the complete UI"""
@@ -208,7 +326,7 @@ class PMPConverterGUI:
         self.repack_btn.pack(side=tk.LEFT)
         
     def create_autoconvert(self, parent):
-        """Create auto-convert on startup section"""
+        """Create auto-convert section"""
         autoconvert_frame = tk.Frame(parent, bg=self.COLORS['bg_medium'])
         autoconvert_frame.pack(fill=tk.X, pady=(0, 15))
         
@@ -220,7 +338,7 @@ class PMPConverterGUI:
         
         checkbox = tk.Checkbutton(
             inner,
-            text="🔄 Convert folder to .pmp on startup",
+            text="🔄 Convert folder to .pmp on startup and when it changes",
             variable=self.autoconvert_enabled,
             command=self.on_autoconvert_toggled,
             font=("Segoe UI", 10, "bold"),
@@ -322,31 +440,96 @@ class PMPConverterGUI:
         )
         dest_btn.pack(side=tk.LEFT)
         
+        # Polling interval, only used when the source folder is on a network share
+        interval_frame = tk.Frame(self.folder_frame, bg=self.COLORS['bg_medium'])
+        interval_frame.pack(fill=tk.X, pady=(8, 0))
+        
+        interval_label = tk.Label(
+            interval_frame,
+            text="⏱️ Poll every (s):",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['bg_medium'],
+            width=15,
+            anchor=tk.W
+        )
+        interval_label.pack(side=tk.LEFT, padx=(20, 10))
+        
+        self.watch_interval_var = tk.IntVar(value=self.DEFAULT_WATCH_INTERVAL)
+        interval_spin = tk.Spinbox(
+            interval_frame,
+            from_=1,
+            to=3600,
+            textvariable=self.watch_interval_var,
+            command=self.on_watch_interval_changed,
+            font=("Segoe UI", 9),
+            bg=self.COLORS['bg_light'],
+            fg=self.COLORS['text'],
+            buttonbackground=self.COLORS['bg_light'],
+            insertbackground=self.COLORS['text'],
+            relief=tk.FLAT,
+            width=6
+        )
+        interval_spin.pack(side=tk.LEFT)
+        interval_spin.bind("<Return>", lambda e: self.on_watch_interval_changed())
+        interval_spin.bind("<FocusOut>", lambda e: self.on_watch_interval_changed())
+        
+        interval_hint = tk.Label(
+            interval_frame,
+            text="Network shares only. Lower reacts faster but rescans the whole folder more often.",
+            font=("Segoe UI", 8),
+            fg=self.COLORS['info'],
+            bg=self.COLORS['bg_medium'],
+            anchor=tk.W
+        )
+        interval_hint.pack(side=tk.LEFT, padx=(10, 0))
+        
+    def get_watch_interval(self):
+        """Polling interval in seconds, falling back to the default on bad input"""
+        try:
+            interval = int(self.watch_interval_var.get())
+        except (tk.TclError, ValueError):
+            return self.DEFAULT_WATCH_INTERVAL
+        return max(1, interval)
+        
+    def on_watch_interval_changed(self):
+        """Apply a new polling interval"""
+        interval = self.get_watch_interval()
+        if self._watcher is not None and self._watcher.interval == interval:
+            return
+        self.update_folder_watcher()
+        self._schedule_save()
+        
     def on_autoconvert_toggled(self):
         """Handle auto-convert checkbox toggle"""
         if self.autoconvert_enabled.get():
             self.folder_frame.pack(fill=tk.X, pady=(5, 0))
-            self.add_log(LogLevel.INFO, "MAIN", "Auto-convert on startup enabled")
+            self.add_log(LogLevel.INFO, "MAIN", "Auto-convert enabled")
         else:
             self.folder_frame.pack_forget()
-            self.add_log(LogLevel.INFO, "MAIN", "Auto-convert on startup disabled")
-        self.save_settings()  # Save when toggled
+            self.add_log(LogLevel.INFO, "MAIN", "Auto-convert disabled")
+        self.update_folder_watcher()
+        self._schedule_save()  # Save when toggled
     
     def browse_source_folder(self):
         """Browse for source folder"""
+        from tkinter import filedialog
         folder = filedialog.askdirectory(title="Select Source Folder to Convert")
         if folder:
             self.source_folder_var.set(folder)
             self.add_log(LogLevel.INFO, "MAIN", f"Source folder set: {folder}")
-            self.save_settings()  # Save when folder selected
+            self.update_folder_watcher()
+            self._schedule_save()  # Save when folder selected
     
     def browse_dest_folder(self):
         """Browse for destination folder"""
+        from tkinter import filedialog
         folder = filedialog.askdirectory(title="Select Destination Folder for .pmp")
         if folder:
             self.dest_folder_var.set(folder)
             self.add_log(LogLevel.INFO, "MAIN", f"Destination folder set: {folder}")
-            self.save_settings()  # Save when folder selected
+            self.update_folder_watcher()
+            self._schedule_save()  # Save when folder selected
         
     def create_progress(self, parent):
         """Create progress bars section"""
@@ -396,6 +579,8 @@ class PMPConverterGUI:
         
     def create_logs(self, parent):
         """Create logs console section"""
+        from tkinter import scrolledtext
+        
         logs_frame = tk.Frame(parent, bg=self.COLORS['bg_dark'])
         logs_frame.pack(fill=tk.BOTH, expand=True)
         
@@ -481,6 +666,9 @@ class PMPConverterGUI:
         )
         self.log_text.pack(fill=tk.BOTH, expand=True)
         
+        # Read-only for the user; _bulk_log unlocks it for programmatic writes
+        self.log_text.configure(state=tk.DISABLED)
+        
         # Configure text tags for coloring
         self.log_text.tag_config('INFO', foreground=self.COLORS['info'])
         self.log_text.tag_config('DEBUG', foreground=self.COLORS['text'])
@@ -517,6 +705,8 @@ class PMPConverterGUI:
         
     def unpack_file(self):
         """Handle unpack button click"""
+        from tkinter import filedialog
+        
         file_path = filedialog.askopenfilename(
             title="Select .pmp file to unpack",
             filetypes=[("PenguinMod Project", "*.pmp"), ("All Files", "*.*")]
@@ -532,31 +722,70 @@ class PMPConverterGUI:
         if not output_dir:
             return
             
+        if not self._begin_manual():
+            return
+            
         self.add_log(LogLevel.INFO, "MAIN", f"Starting unpack: {Path(file_path).name}")
         self.disable_buttons()
         
         # Run in thread to prevent UI freeze
         thread = threading.Thread(
             target=self.run_unpack,
-            args=(file_path, output_dir),
+            args=(file_path, output_dir, self.get_selected_converter_type()),
             daemon=True
         )
         thread.start()
         
-    def run_unpack(self, file_path, output_dir):
-        """Run unpack operation in background thread"""
+    def _begin_manual(self):
+        """Mark a manual operation as running, unless another one already is
+        
+        Watched changes while it runs (an unpack into the source folder
+        rewrites it) are held back as one auto-convert after it finishes.
+        """
+        with self._autoconvert_lock:
+            busy = self._manual_in_flight or self._repack_in_flight
+            if not busy:
+                self._manual_in_flight = True
+        if busy:
+            self.add_log(LogLevel.WARN, "MAIN", "Another conversion is still running")
+        return not busy
+        
+    def _end_run(self, manual):
+        """Clear a run's busy flag and start the held-back auto-convert, if any
+        
+        Returns whether nothing is running any more, i.e. the buttons can
+        be enabled again.
+        """
+        with self._autoconvert_lock:
+            if manual:
+                self._manual_in_flight = False
+            else:
+                self._repack_in_flight = False
+            idle = not (self._manual_in_flight or self._repack_in_flight)
+            rerun = idle and self._repack_rerun
+            if rerun:
+                self._repack_rerun = False
+        if rerun:
+            self.post_ui("folder_changed")
+        return idle
+        
+    def run_unpack(self, file_path, output_dir, converter_type):
+        """Run unpack operation in background thread
+        
+        Never touches Tk: progress, popups and button state all go through
+        the UI queue.
+        """
         try:
-            converter_type = self.get_selected_converter_type()
-            
             # Set up progress callbacks
             def total_progress_cb(percent, message):
-                self.root.after(0, self.update_total_progress, percent, message)
+                self.post_total_progress(percent, message)
                 
             def item_progress_cb(percent, message):
-                self.root.after(0, self.update_item_progress, percent, message)
+                pass  # Item progress removed
                 
             def log_cb(level, source, message):
                 self.add_log(level, source, message)
+            log_cb.is_enabled = self.log_enabled
                 
             success = self.converter.unpack(
                 file_path,
@@ -569,29 +798,26 @@ class PMPConverterGUI:
             
             if success:
                 self.add_log(LogLevel.INFO, "MAIN", "✅ Unpack completed successfully!")
-                self.root.after(0, lambda: messagebox.showinfo(
-                    "Success",
-                    f"Project unpacked successfully!\n\nOutput: {output_dir}"
-                ))
+                self.post_ui("message", True, "Success",
+                             f"Project unpacked successfully!\n\nOutput: {output_dir}")
             else:
                 self.add_log(LogLevel.FATAL, "MAIN", "❌ Unpack failed!")
-                self.root.after(0, lambda: messagebox.showerror(
-                    "Error",
-                    "Failed to unpack project. Check logs for details."
-                ))
+                self.post_ui("message", False, "Error",
+                             "Failed to unpack project. Check logs for details.")
                 
         except Exception as e:
             self.add_log(LogLevel.FATAL, "MAIN", f"Exception during unpack: {str(e)}")
-            self.root.after(0, lambda: messagebox.showerror(
-                "Fatal Error",
-                f"An error occurred:\n{str(e)}"
-            ))
+            self.post_ui("message", False, "Fatal Error", f"An error occurred:\n{str(e)}")
         finally:
-            self.root.after(0, self.enable_buttons)
-            self.root.after(0, self.reset_progress)
+            self.post_ui("reset")
+            # An auto-convert that started alongside may still be running
+            if self._end_run(manual=True):
+                self.post_ui("buttons", True)
             
     def repack_folder(self):
         """Handle repack button click"""
+        from tkinter import filedialog
+        
         folder_path = filedialog.askdirectory(
             title="Select unpacked project folder"
         )
@@ -608,30 +834,36 @@ class PMPConverterGUI:
         if not output_file:
             return
             
+        if not self._begin_manual():
+            return
+            
         self.add_log(LogLevel.INFO, "MAIN", f"Starting repack: {Path(folder_path).name}")
         self.disable_buttons()
         
         # Run in thread
         thread = threading.Thread(
             target=self.run_repack,
-            args=(folder_path, output_file),
+            args=(folder_path, output_file, self.get_selected_converter_type()),
             daemon=True
         )
         thread.start()
         
-    def run_repack(self, folder_path, output_file):
-        """Run repack operation in background thread"""
+    def run_repack(self, folder_path, output_file, converter_type):
+        """Run repack operation in background thread
+        
+        Never touches Tk: progress, popups and button state all go through
+        the UI queue.
+        """
         try:
-            converter_type = self.get_selected_converter_type()
-            
             def total_progress_cb(percent, message):
-                self.root.after(0, self.update_total_progress, percent, message)
+                self.post_total_progress(percent, message)
                 
             def item_progress_cb(percent, message):
-                self.root.after(0, self.update_item_progress, percent, message)
+                pass  # Item progress removed
                 
             def log_cb(level, source, message):
                 self.add_log(level, source, message)
+            log_cb.is_enabled = self.log_enabled
                 
             success = self.converter.repack(
                 folder_path,
@@ -644,26 +876,21 @@ class PMPConverterGUI:
             
             if success:
                 self.add_log(LogLevel.INFO, "MAIN", "✅ Repack completed successfully!")
-                self.root.after(0, lambda: messagebox.showinfo(
-                    "Success",
-                    f"Project repacked successfully!\n\nOutput: {output_file}"
-                ))
+                self.post_ui("message", True, "Success",
+                             f"Project repacked successfully!\n\nOutput: {output_file}")
             else:
                 self.add_log(LogLevel.FATAL, "MAIN", "❌ Repack failed!")
-                self.root.after(0, lambda: messagebox.showerror(
-                    "Error",
-                    "Failed to repack project. Check logs for details."
-                ))
+                self.post_ui("message", False, "Error",
+                             "Failed to repack project. Check logs for details.")
                 
         except Exception as e:
             self.add_log(LogLevel.FATAL, "MAIN", f"Exception during repack: {str(e)}")
-            self.root.after(0, lambda: messagebox.showerror(
-                "Fatal Error",
-                f"An error occurred:\n{str(e)}"
-            ))
+            self.post_ui("message", False, "Fatal Error", f"An error occurred:\n{str(e)}")
         finally:
-            self.root.after(0, self.enable_buttons)
-            self.root.after(0, self.reset_progress)
+            self.post_ui("reset")
+            # An auto-convert that started alongside may still be running
+            if self._end_run(manual=True):
+                self.post_ui("buttons", True)
             
     def update_total_progress(self, percent, message):
         """Update total progress bar"""
@@ -674,6 +901,83 @@ class PMPConverterGUI:
         """Update item progress bar - REMOVED"""
         pass  # Item progress bar removed from GUI
         
+    def post_ui(self, kind, *args):
+        """Queue a UI update from a worker thread, waking the GUI once per batch"""
+        if self._closing:
+            return
+        self._ui_q.put((kind, *args))
+        if not self._ui_pending:
+            self._ui_pending = True
+            self.root.event_generate("<<UIUpdate>>", when="tail")
+            
+    def post_total_progress(self, percent, message):
+        """Report progress from a worker thread; the UI only applies the latest value"""
+        self.post_ui("total", percent, message)
+        
+    def process_ui_updates(self):
+        """Drain queued UI updates, applying only the latest progress value"""
+        self._ui_pending = False
+        reset = False
+        total = None
+        buttons = None
+        popups = []
+        folder_changed = False
+        while True:
+            try:
+                kind, *args = self._ui_q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "total":
+                total = args
+            elif kind == "reset":
+                # Later progress still applies, earlier progress is dropped
+                reset = True
+                total = None
+            elif kind == "buttons":
+                buttons = args[0]
+            elif kind == "done":
+                popups.append((self.show_autoconvert_result, args))
+            elif kind == "message":
+                popups.append((self.show_message, args))
+            elif kind == "folder_changed":
+                folder_changed = True
+                
+        if reset:
+            self.reset_progress()
+        if total is not None:
+            self.update_total_progress(*total)
+        if buttons is not None:
+            if buttons:
+                self.enable_buttons()
+            else:
+                self.disable_buttons()
+        if folder_changed:
+            self.start_autoconvert(on_startup=False)
+            
+        # Popups last, since each one blocks until dismissed
+        for show, args in popups:
+            show(*args)
+            
+    def show_message(self, success, title, text):
+        """Show the info or error popup a worker thread asked for"""
+        from tkinter import messagebox
+        
+        if success:
+            messagebox.showinfo(title, text)
+        else:
+            messagebox.showerror(title, text)
+            
+    def show_autoconvert_result(self, success, output_file, error=None):
+        """Tell the user how an auto-convert run ended"""
+        from tkinter import messagebox
+        
+        if error is not None:
+            messagebox.showerror("Error", f"Auto-convert error:\n{error}")
+        elif success:
+            messagebox.showinfo("Auto-Convert Complete", f"Successfully converted to:\n{output_file}")
+        else:
+            messagebox.showerror("Auto-Convert Failed", "Failed to convert project. Check logs for details.")
+            
     def reset_progress(self):
         """Reset progress bars"""
         self.total_progress['value'] = 0
@@ -689,51 +993,126 @@ class PMPConverterGUI:
         self.unpack_btn.config(state=tk.NORMAL)
         self.repack_btn.config(state=tk.NORMAL)
         
+    def log_enabled(self, level) -> bool:
+        """Whether add_log keeps entries at level"""
+        return self.capture_all or self.log_filter.is_enabled(level)
+        
     def add_log(self, level, source, message):
-        """Add log entry to queue"""
-        entry = LogEntry(level, source, message)
-        self.log_queue.put(entry)
+        """Add log entry through the queue-backed logger"""
+        # Unless every entry is kept for export, hidden levels are dropped
+        # before any record or entry is built
+        if not self.log_enabled(level):
+            return
+        self._logger.log(
+            STDLIB_LEVELS[level],
+            message,
+            extra={'pmp_level': level, 'pmp_source': source}
+        )
         
     def process_logs(self):
         """Process log queue and update UI"""
+        # Clear before draining so entries queued mid-drain raise a new event
+        self._log_pending = False
+        
+        # Drain everything that is queued in one pass
+        entries = []
         try:
             while True:
-                entry = self.log_queue.get_nowait()
-                self.log_entries.append(entry)
-                
-                if self.log_filter.should_show(entry):
-                    self.display_log(entry)
-                    
+                entries.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
+            
+        if entries:
+            self.log_entries.extend(entries)
+            with self._bulk_log():
+                self.display_logs([entry for entry in entries if entry.show])
+                self.trim_log_text()
+            
+    @contextmanager
+    def _bulk_log(self):
+        """Unlock the read-only console for a batch of edits, scrolling once at the end"""
+        self.log_text.configure(state=tk.NORMAL)
+        try:
+            yield
         finally:
-            # Schedule next check
-            self.root.after(100, self.process_logs)
+            self.log_text.configure(state=tk.DISABLED)
+            self.log_text.see(tk.END)
+            
+    def set_log_capacity(self, capacity):
+        """Change how many log entries are kept, dropping the oldest if needed"""
+        try:
+            capacity = max(1, int(capacity))
+        except (TypeError, ValueError):
+            capacity = self.DEFAULT_LOG_CAPACITY
+        if capacity == self._log_capacity:
+            return
+        self._log_capacity = capacity
+        self.log_entries = collections.deque(self.log_entries, maxlen=capacity)
+        with self._bulk_log():
+            self.trim_log_text()
+            
+    def trim_log_text(self):
+        """Drop the oldest console lines once the widget exceeds the log capacity"""
+        # The widget always ends with an empty line after the last newline
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        excess = line_count - self._log_capacity
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
             
-    def display_log(self, entry):
-        """Display a log entry in the text widget"""
-        emoji = self.EMOJI_MAP.get(entry.level, '•')
-        timestamp = entry.timestamp.strftime("%H:%M:%S")
+    def format_log_line(self, entry):
+        """Format a log entry for the text widget (called on the listener thread)"""
+        emoji = self._emoji_by_val[entry.level.value]
+        timestamp = time.strftime("%H:%M:%S", time.localtime(entry.ts))
+        
+        return f"[{timestamp}] {emoji} [{entry.level.name}][{entry.source}] {entry.message}\n"
         
-        log_line = f"[{timestamp}] {emoji} [{entry.level.name}][{entry.source}] {entry.message}\n"
+    def display_logs(self, entries):
+        """Display a batch of log entries with a single multi-tag insert
         
-        self.log_text.insert(tk.END, log_line, entry.level.name)
-        self.log_text.see(tk.END)
+        Must be called inside _bulk_log(), which unlocks the widget and scrolls.
+        """
+        if not entries:
+            return
+            
+        # Text.insert takes alternating chunk/tag pairs; consecutive lines of
+        # the same level share one chunk, and order is preserved
+        tag_by_val = self._tag_by_val
+        args = [tk.END]
+        run_tag = tag_by_val[entries[0].level.value]
+        run_lines = []
+        for entry in entries:
+            tag = tag_by_val[entry.level.value]
+            if tag != run_tag:
+                args += ("".join(run_lines), run_tag)
+                run_tag = tag
+                run_lines = []
+            line = entry.display_line
+            if line is None:
+                line = entry.display_line = self.format_log_line(entry)
+            run_lines.append(line)
+        args += ("".join(run_lines), run_tag)
+        
+        self.log_text.insert(*args)
         
     def clear_logs(self):
         """Clear all logs"""
+        from tkinter import messagebox
+        
         result = messagebox.askyesno(
             "Clear Logs",
             "Are you sure you want to clear all logs?"
         )
         
         if result:
-            self.log_text.delete(1.0, tk.END)
+            with self._bulk_log():
+                self.log_text.delete(1.0, tk.END)
             self.log_entries.clear()
             self.add_log(LogLevel.INFO, "MAIN", "Logs cleared")
             
     def export_logs(self):
         """Export logs to file"""
+        from tkinter import filedialog, messagebox
+        
         if not self.log_entries:
             messagebox.showinfo("Export Logs", "No logs to export")
             return
@@ -748,16 +1127,22 @@ class PMPConverterGUI:
             return
             
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("PenguinMod File Converter - Log Export\n")
-                f.write("=" * 80 + "\n")
-                f.write(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
-                
-                for entry in self.log_entries:
-                    emoji = self.EMOJI_MAP.get(entry.level, '•')
-                    timestamp = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"[{timestamp}] {emoji} [{entry.level.name}][{entry.source}] {entry.message}\n")
+            # Build the whole export in memory and write it in one call
+            lines = [
+                "PenguinMod File Converter - Log Export\n",
+                "=" * 80 + "\n",
+                f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+                "=" * 80 + "\n\n"
+            ]
+            for entry in self.log_entries:
+                emoji = self._emoji_by_val[entry.level.value]
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.ts))
+                lines.append(f"[{timestamp}] {emoji} [{entry.level.name}][{entry.source}] {entry.message}\n")
+            data = "".join(lines)
+            
+            # Text mode keeps the platform's newline translation
+            with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(data)
                     
             self.add_log(LogLevel.INFO, "MAIN", f"Logs exported to: {file_path}")
             messagebox.showinfo("Success", f"Logs exported successfully!\n\n{file_path}")
@@ -770,7 +1155,7 @@ class PMPConverterGUI:
         """Show filter menu popup"""
         popup = tk.Toplevel(self.root)
         popup.title("🔍 Filter Logs")
-        popup.geometry("350x300")
+        popup.geometry("350x340")
         popup.configure(bg=self.COLORS['bg_medium'])
         popup.resizable(False, False)
         
@@ -811,6 +1196,22 @@ class PMPConverterGUI:
             )
             check.pack(anchor=tk.W, pady=5)
             
+        # Unchecked levels are dropped unless kept for export_logs
+        # ('capture_all_logs' setting)
+        keep_var = tk.BooleanVar(value=self.capture_all)
+        keep_check = tk.Checkbutton(
+            check_frame,
+            text="💾 Keep hidden levels for export",
+            variable=keep_var,
+            font=("Segoe UI", 10),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['bg_medium'],
+            selectcolor=self.COLORS['bg_light'],
+            activebackground=self.COLORS['bg_medium'],
+            activeforeground=self.COLORS['text']
+        )
+        keep_check.pack(anchor=tk.W, pady=(10, 5))
+        
         # Buttons
         btn_frame = tk.Frame(popup, bg=self.COLORS['bg_medium'])
         btn_frame.pack(pady=15)
@@ -818,6 +1219,9 @@ class PMPConverterGUI:
         def apply_filter():
             for level, var in checkboxes.items():
                 self.log_filter.set_level(level, var.get())
+            if keep_var.get() != self.capture_all:
+                self.capture_all = keep_var.get()
+                self._schedule_save()
             self.refresh_logs()
             popup.destroy()
             
@@ -851,53 +1255,161 @@ class PMPConverterGUI:
         
     def refresh_logs(self):
         """Refresh log display based on current filter"""
-        self.log_text.delete(1.0, tk.END)
-        for entry in self.log_entries:
-            if self.log_filter.should_show(entry):
-                self.display_log(entry)
+        with self._bulk_log():
+            self.log_text.delete(1.0, tk.END)
+            self.display_logs([entry for entry in self.log_entries if self.log_filter.should_show(entry)])
     
     def load_settings(self):
         """Load settings from config file"""
-        import json
+        import pmp_json
         config_file = Path.home() / ".pmp_converter_config.json"
         
         if config_file.exists():
             try:
-                with open(config_file, 'r') as f:
-                    settings = json.load(f)
+                # Reparse only when the file changed since the last load
+                st = config_file.stat()
+                cached = self._settings_cache
+                if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                    settings = cached[2]
+                else:
+                    settings = pmp_json.loads(config_file.read_bytes())
+                    self._settings_cache = (st.st_mtime_ns, st.st_size, settings)
                     
                 self.autoconvert_enabled.set(settings.get('autoconvert_enabled', False))
                 self.source_folder_var.set(settings.get('source_folder', ''))
                 self.dest_folder_var.set(settings.get('dest_folder', ''))
+                self.watch_interval_var.set(settings.get('watch_interval_sec', self.DEFAULT_WATCH_INTERVAL))
+                self.set_log_capacity(settings.get('log_capacity', self.DEFAULT_LOG_CAPACITY))
+                self.capture_all = bool(settings.get('capture_all_logs', False))
                 
                 # Show folder frame if enabled
                 if self.autoconvert_enabled.get():
                     self.folder_frame.pack(fill=tk.X, pady=(5, 0))
                     
                 self.add_log(LogLevel.INFO, "SETTINGS", "Settings loaded")
+                self.update_folder_watcher()
             except Exception as e:
                 self.add_log(LogLevel.WARN, "SETTINGS", f"Failed to load settings: {e}")
     
+    def _collect_settings(self):
+        """Read the current settings from the UI variables (UI thread only)"""
+        return {
+            'autoconvert_enabled': self.autoconvert_enabled.get(),
+            'source_folder': self.source_folder_var.get(),
+            'dest_folder': self.dest_folder_var.get(),
+            'watch_interval_sec': self.get_watch_interval(),
+            'log_capacity': self._log_capacity,
+            'capture_all_logs': self.capture_all
+        }
+        
     def save_settings(self):
         """Save settings to config file"""
-        import json
+        self._settings_snapshot = self._collect_settings()
+        self._write_settings()
+        
+    def _schedule_save(self):
+        """Save settings shortly, collapsing bursts of changes into one write"""
+        if self._settings_dirty_after is not None:
+            self.root.after_cancel(self._settings_dirty_after)
+        self._settings_dirty_after = self.root.after(250, self._do_save_settings)
+        
+    def _do_save_settings(self):
+        """Snapshot settings on the UI thread and write them in the background"""
+        self._settings_dirty_after = None
+        self._settings_snapshot = self._collect_settings()
+        threading.Thread(target=self._write_settings, daemon=True).start()
+        
+    def _write_settings(self):
+        """Write the latest settings snapshot to the config file"""
+        import pmp_json
         config_file = Path.home() / ".pmp_converter_config.json"
         
-        settings = {
-            'autoconvert_enabled': self.autoconvert_enabled.get(),
-            'source_folder': self.source_folder_var.get(),
-            'dest_folder': self.dest_folder_var.get()
-        }
+        # Writers take the newest snapshot under the lock, so the last write wins
+        with self._settings_lock:
+            settings = self._settings_snapshot
+            try:
+                # Write a sibling file and swap it in so a crash can't leave
+                # a half-written config behind
+                tmp_file = config_file.with_suffix('.json.tmp')
+                tmp_file.write_bytes(pmp_json.dumps(settings, indent=True))
+                os.replace(tmp_file, config_file)
+                self.add_log(LogLevel.DEBUG, "SETTINGS", "Settings saved")
+            except Exception as e:
+                self.add_log(LogLevel.WARN, "SETTINGS", f"Failed to save settings: {e}")
+    
+    def update_folder_watcher(self):
+        """Watch the source folder while auto-convert is enabled (needs watchdog)"""
+        import pmp_watcher
+        
+        self._stop_folder_watcher()
         
+        source = self.source_folder_var.get()
+        dest = self.dest_folder_var.get()
+        if not self.autoconvert_enabled.get() or not source or not dest:
+            return
+            
+        if not pmp_watcher.watchdog_available():
+            if not self._watchdog_note_shown:
+                self._watchdog_note_shown = True
+                self.add_log(LogLevel.NOTE, "AUTO-CONVERT", "Install 'watchdog' to also convert when the source folder changes")
+            return
+            
+        if not os.path.isdir(source):
+            return
+            
+        # Ignore the destination so our own output can't retrigger a run
+        watcher = pmp_watcher.FolderWatcher(
+            source,
+            self._on_folder_event,
+            ignore=(dest,),
+            interval=self.get_watch_interval()
+        )
         try:
-            with open(config_file, 'w') as f:
-                json.dump(settings, f, indent=2)
-            self.add_log(LogLevel.DEBUG, "SETTINGS", "Settings saved")
+            watcher.start()
         except Exception as e:
-            self.add_log(LogLevel.WARN, "SETTINGS", f"Failed to save settings: {e}")
-    
+            self.add_log(LogLevel.WARN, "AUTO-CONVERT", f"Could not watch source folder: {e}")
+            return
+        self._watcher = watcher
+        mode = f"polling every {watcher.interval}s" if watcher.polling else "native events"
+        self.add_log(LogLevel.INFO, "AUTO-CONVERT", f"👀 Watching source folder ({mode}): {source}")
+        
+    def _stop_folder_watcher(self):
+        """Stop the source folder watcher and any pending debounced run"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        with self._autoconvert_lock:
+            timer, self._debounce_timer = self._debounce_timer, None
+        if timer is not None:
+            timer.cancel()
+            
+    def _on_folder_event(self):
+        """Restart the debounce window for a watched change (watcher thread)"""
+        # Editors and sync tools emit bursts of events; only the quiet
+        # period after the last one triggers a run
+        with self._autoconvert_lock:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+            timer = threading.Timer(self.WATCH_DEBOUNCE_SEC, self.post_ui, args=("folder_changed",))
+            timer.daemon = True
+            self._debounce_timer = timer
+            timer.start()
+        
+    def _on_first_map(self, event=None):
+        """Start the startup auto-convert the first time the window is shown"""
+        if self._first_map_done:
+            return
+        self._first_map_done = True
+        self.root.unbind("<Map>", self._map_bind_id)
+        # Queued behind the deferred load_settings so the folders are filled in
+        self.root.after_idle(self.check_autoconvert_on_startup)
+        
     def check_autoconvert_on_startup(self):
         """Check and perform auto-convert if enabled"""
+        self.start_autoconvert(on_startup=True)
+        
+    def start_autoconvert(self, on_startup):
+        """Start an auto-convert run in the background if enabled and none is running"""
         if not self.autoconvert_enabled.get():
             return
             
@@ -905,9 +1417,43 @@ class PMPConverterGUI:
         dest = self.dest_folder_var.get()
         
         if not source or not dest:
-            self.add_log(LogLevel.WARN, "AUTO-CONVERT", "Auto-convert enabled but folders not set")
+            if on_startup:
+                self.add_log(LogLevel.WARN, "AUTO-CONVERT", "Auto-convert enabled but folders not set")
+            return
+            
+        with self._autoconvert_lock:
+            busy = self._repack_in_flight or self._manual_in_flight
+            if not busy:
+                self._repack_in_flight = True
+            elif not on_startup:
+                # Changes during a run get one follow-up run once it finishes
+                self._repack_rerun = True
+        if busy:
+            if not on_startup:
+                self.add_log(LogLevel.DEBUG, "AUTO-CONVERT", "Conversion already running, will rerun when done")
             return
+        converter_type = self.get_selected_converter_type()
         
+        # Folder checks and the repack itself stay off the UI thread
+        thread = threading.Thread(
+            target=self._run_autoconvert,
+            args=(source, dest, on_startup, converter_type),
+            daemon=True
+        )
+        thread.start()
+        
+    def _run_autoconvert(self, source, dest, on_startup, converter_type):
+        """Validate auto-convert folders and repack (runs in a background thread)"""
+        try:
+            self._autoconvert(source, dest, on_startup, converter_type)
+        except Exception as e:
+            self.add_log(LogLevel.ERROR, "AUTO-CONVERT", f"Error: {str(e)}")
+        finally:
+            if self._end_run(manual=False):
+                self.post_ui("buttons", True)
+            
+    def _autoconvert(self, source, dest, on_startup, converter_type):
+        """Check the folders, then repack"""
         source_path = Path(source)
         dest_path = Path(dest)
         
@@ -920,63 +1466,144 @@ class PMPConverterGUI:
             return
         
         # Perform auto-convert
-        self.add_log(LogLevel.INFO, "AUTO-CONVERT", "🔄 Starting automatic conversion on startup...")
+        if on_startup:
+            self.add_log(LogLevel.INFO, "AUTO-CONVERT", "🔄 Starting automatic conversion on startup...")
+        else:
+            self.add_log(LogLevel.INFO, "AUTO-CONVERT", "🔄 Source folder changed, converting...")
         
         # Create output filename
         folder_name = source_path.name
         output_file = dest_path / f"{folder_name}.pmp"
         
-        # Run repack in thread
-        thread = threading.Thread(
-            target=self._auto_repack_thread,
-            args=(source, str(output_file)),
-            daemon=True
-        )
-        thread.start()
+        # Popups would be noisy for every save in the watched folder
+        self._auto_repack_thread(source, str(output_file), converter_type, notify=on_startup)
     
-    def _auto_repack_thread(self, folder_path, output_file):
-        """Thread worker for auto-convert repack"""
+    def _get_repack_pool(self):
+        """Single-worker process pool for auto-convert repacks, started on first use"""
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            import pmp_core
+            
+            if self._pool_events is None:
+                self._pool_events = multiprocessing.Queue()
+                threading.Thread(target=self._forward_pool_events, daemon=True).start()
+            self._pool = ProcessPoolExecutor(
+                max_workers=1,
+                initializer=pmp_core.init_worker,
+                initargs=(self._pool_events,)
+            )
+        return self._pool
+        
+    def _forward_pool_events(self):
+        """Relay logs and progress from the worker process (runs in a thread)"""
+        events = self._pool_events
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            kind, *args = event
+            if kind == "log":
+                self.add_log(*args)
+            elif kind == "total":
+                self.post_total_progress(*args)
+            elif kind == "end":
+                if args[0] == self._pool_task_id:
+                    self._pool_task_done.set()
+                
+    def _auto_repack_thread(self, folder_path, output_file, converter_type, notify=True):
+        """Thread worker for auto-convert repack
+        
+        Never touches Tk: button state, progress and the result popup all go
+        through the UI queue.
+        """
         try:
-            self.disable_buttons()
-            self.root.after(0, self.add_log, LogLevel.INFO, "AUTO-CONVERT", f"Converting: {folder_path}")
+            self.post_ui("buttons", False)
+            self.add_log(LogLevel.INFO, "AUTO-CONVERT", f"Converting: {folder_path}")
             
             # Set up progress callbacks
             def total_progress_cb(percent, message):
-                self.root.after(0, self.update_total_progress, percent, message)
+                self.post_total_progress(percent, message)
             
             def item_progress_cb(percent, message):
                 pass  # Item progress removed
             
             def log_cb(level, category, message):
-                self.root.after(0, self.add_log, level, category, message)
+                self.add_log(level, category, message)
+            log_cb.is_enabled = self.log_enabled
             
-            # Perform repack
-            converter_type = self.get_selected_converter_type()
-            success = self.converter.repack(
-                folder_path,
-                output_file,
-                converter_type,
-                total_progress_cb,
-                item_progress_cb,
-                log_cb
-            )
+            # Perform repack in the worker process so compression doesn't
+            # compete with the UI thread for the GIL
+            import pmp_core
+            from concurrent.futures.process import BrokenProcessPool
+            self._pool_task_id += 1
+            self._pool_task_done.clear()
+            log_levels = [level.value for level in LogLevel if self.log_enabled(level)]
+            try:
+                future = self._get_repack_pool().submit(
+                    pmp_core.repack_task,
+                    folder_path,
+                    output_file,
+                    converter_type.value,
+                    self._pool_task_id,
+                    log_levels
+                )
+                success = future.result()
+                # Its logs and progress come through the relay thread; let
+                # them land before the result and the progress reset
+                self._pool_task_done.wait(self.POOL_EVENTS_TIMEOUT_SEC)
+            except (BrokenProcessPool, OSError) as e:
+                # The pool itself failed (e.g. the worker died); run here instead
+                pool, self._pool = self._pool, None
+                if pool is not None:
+                    try:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    except TypeError:  # cancel_futures is new in Python 3.9
+                        pool.shutdown(wait=False)
+                self.add_log(LogLevel.WARN, "AUTO-CONVERT", f"Worker process unavailable, converting in-process: {e}")
+                # Not self.converter: a manual operation may be using that one
+                success = pmp_core.PMPConverter().repack(
+                    folder_path,
+                    output_file,
+                    converter_type,
+                    total_progress_cb,
+                    item_progress_cb,
+                    log_cb
+                )
             
             if success:
-                self.root.after(0, self.add_log, LogLevel.INFO, "AUTO-CONVERT", f"✅ Auto-convert complete: {output_file}")
-                self.root.after(0, messagebox.showinfo, "Auto-Convert Complete", 
-                               f"Successfully converted to:\n{output_file}")
+                self.add_log(LogLevel.INFO, "AUTO-CONVERT", f"✅ Auto-convert complete: {output_file}")
             else:
-                self.root.after(0, self.add_log, LogLevel.ERROR, "AUTO-CONVERT", "❌ Auto-convert failed")
-                self.root.after(0, messagebox.showerror, "Auto-Convert Failed", 
-                               "Failed to convert project. Check logs for details.")
+                self.add_log(LogLevel.ERROR, "AUTO-CONVERT", "❌ Auto-convert failed")
+            if notify:
+                self.post_ui("done", success, output_file, None)
                 
         except Exception as e:
-            self.root.after(0, self.add_log, LogLevel.ERROR, "AUTO-CONVERT", f"Error: {str(e)}")
-            self.root.after(0, messagebox.showerror, "Error", f"Auto-convert error:\n{str(e)}")
+            self.add_log(LogLevel.ERROR, "AUTO-CONVERT", f"Error: {str(e)}")
+            self.post_ui("done", False, output_file, str(e))
         finally:
-            self.root.after(0, self.reset_progress)
-            self.root.after(0, self.enable_buttons)
+            self.post_ui("reset")
 
+    def on_close(self):
+        """Stop forwarding logs and close the window"""
+        self._stop_folder_watcher()
+        
+        # Flush a debounced save that has not fired yet
+        if self._settings_dirty_after is not None:
+            self.root.after_cancel(self._settings_dirty_after)
+            self._settings_dirty_after = None
+            self.save_settings()
+            
+        # Let the worker process go and stop the relay thread
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        if self._pool_events is not None:
+            self._pool_events.put(None)
+            
+        # The listener thread is a daemon; just stop it touching Tk
+        self._closing = True
+        self.root.destroy()
 
 
 def main():
@@ -3,17 +3,55 @@ PenguinMod File Converter - Core Converter
 Main converter logic coordinating unpack/repack operations
 """
 
-from pathlib import Path
+import functools
+import os
 from typing import Callable, Optional
 import zipfile
-import json
 
+import pmp_json
 from pmp_logger import LogLevel
 from pmp_types import ConverterType
 from pmp_unpacker import PMPUnpacker
 from pmp_repacker import PMPRepacker
 
 
+# Read buffer for .pmp archives, so zlib gets large chunks per syscall
+ARCHIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Parsed .pmp_metadata.json files: path -> (st_mtime_ns, st_size, metadata)
+_META_CACHE: dict = {}
+
+
+def _load_metadata(metadata_file: str) -> Optional[dict]:
+    """Load a metadata file, reusing the parsed dict while the file is unchanged
+    
+    Returns None if the file does not exist.
+    """
+    try:
+        st = os.stat(metadata_file)
+    except FileNotFoundError:
+        return None
+        
+    key = metadata_file
+    cached = _META_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+        
+    with open(metadata_file, 'rb') as f:
+        metadata = pmp_json.loads(f.read())
+    _META_CACHE[key] = (st.st_mtime_ns, st.st_size, metadata)
+    return metadata
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_converter_type(value: str) -> Optional[ConverterType]:
+    """Map a metadata converter_type string to a ConverterType, or None if unknown"""
+    try:
+        return ConverterType(value)
+    except ValueError:
+        return None
+        
+        
 class PMPConverter:
     """Main converter orchestrating unpack and repack operations"""
     
@@ -50,30 +88,34 @@ class PMPConverter:
                 log_cb(LogLevel.INFO, "UNPACKER", f"Input: {pmp_file}")
                 log_cb(LogLevel.INFO, "UNPACKER", f"Output: {output_dir}")
                 
-            # Validate input
-            if not Path(pmp_file).exists():
+            # Validate input; one buffered handle serves the check and the unpack
+            try:
+                fp = open(pmp_file, 'rb', buffering=ARCHIVE_BUFFER_SIZE)
+            except FileNotFoundError:
                 if log_cb:
                     log_cb(LogLevel.FATAL, "UNPACKER", f"Input file does not exist: {pmp_file}")
                 return False
                 
-            if not zipfile.is_zipfile(pmp_file):
-                if log_cb:
-                    log_cb(LogLevel.FATAL, "UNPACKER", "Input file is not a valid .pmp/.zip file")
-                return False
+            with fp:
+                if not zipfile.is_zipfile(fp):
+                    if log_cb:
+                        log_cb(LogLevel.FATAL, "UNPACKER", "Input file is not a valid .pmp/.zip file")
+                    return False
+                fp.seek(0)
                 
-            # Create output directory
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Perform unpacking
-            success = self.unpacker.unpack(
-                pmp_file,
-                output_dir,
-                converter_type,
-                total_progress_cb,
-                item_progress_cb,
-                log_cb
-            )
+                # Create output directory
+                os.makedirs(output_dir, exist_ok=True)
+                
+                # Perform unpacking
+                success = self.unpacker.unpack(
+                    pmp_file,
+                    output_dir,
+                    converter_type,
+                    total_progress_cb,
+                    item_progress_cb,
+                    log_cb,
+                    pmp_fileobj=fp
+                )
             
             if success and log_cb:
                 log_cb(LogLevel.INFO, "UNPACKER", "Unpack completed successfully")
@@ -92,7 +134,8 @@ class PMPConverter:
         converter_type: ConverterType,
         total_progress_cb: Optional[Callable] = None,
         item_progress_cb: Optional[Callable] = None,
-        log_cb: Optional[Callable] = None
+        log_cb: Optional[Callable] = None,
+        compresslevel: int = 0
     ) -> bool:
         """
         Repack a folder structure to a .pmp file
@@ -104,6 +147,7 @@ class PMPConverter:
             total_progress_cb: Callback for total progress (percent, message)
             item_progress_cb: Callback for item progress (percent, message)
             log_cb: Callback for log messages (level, source, message)
+            compresslevel: Deflate level, or 0 to pick one from the project size
             
         Returns:
             True if successful, False otherwise
@@ -115,28 +159,29 @@ class PMPConverter:
                 log_cb(LogLevel.INFO, "REPACKER", f"Output: {output_file}")
                 
             # Validate input
-            folder = Path(folder_path)
-            if not folder.exists() or not folder.is_dir():
+            if not os.path.isdir(folder_path):
                 if log_cb:
                     log_cb(LogLevel.FATAL, "REPACKER", f"Input folder does not exist: {folder_path}")
                 return False
                 
             # Detect converter type if metadata exists
-            metadata_file = folder / ".pmp_metadata.json"
+            metadata_file = os.path.join(folder_path, ".pmp_metadata.json")
             detected_type = None
             
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                        detected_type_str = metadata.get('converter_type')
-                        if detected_type_str:
-                            detected_type = ConverterType(detected_type_str)
+            try:
+                metadata = _load_metadata(metadata_file)
+                if metadata is not None:
+                    detected_type_str = metadata.get('converter_type')
+                    if detected_type_str:
+                        detected_type = _resolve_converter_type(detected_type_str)
+                        if detected_type is not None:
                             if log_cb:
                                 log_cb(LogLevel.INFO, "REPACKER", f"Detected converter type from metadata: {detected_type.name}")
-                except Exception as e:
-                    if log_cb:
-                        log_cb(LogLevel.WARN, "REPACKER", f"Could not read metadata: {str(e)}")
+                        elif log_cb:
+                            log_cb(LogLevel.WARN, "REPACKER", f"Unknown converter type in metadata: {detected_type_str}")
+            except Exception as e:
+                if log_cb:
+                    log_cb(LogLevel.WARN, "REPACKER", f"Could not read metadata: {str(e)}")
                         
             # Use detected type if available and different from selected
             if detected_type and detected_type != converter_type:
@@ -152,7 +197,8 @@ class PMPConverter:
                 converter_type,
                 total_progress_cb,
                 item_progress_cb,
-                log_cb
+                log_cb,
+                compresslevel
             )
             
             if success and log_cb:
@@ -164,3 +210,59 @@ class PMPConverter:
             if log_cb:
                 log_cb(LogLevel.FATAL, "REPACKER", f"Repack failed with exception: {str(e)}")
             return False
+
+
+# Event queue of a repack worker process, set by init_worker
+_EVENT_QUEUE = None
+# LogLevel values the GUI keeps, set per task by repack_task (None: all)
+_LOG_LEVELS = None
+
+
+def init_worker(event_queue):
+    """Process pool initializer: remember where to send logs and progress"""
+    global _EVENT_QUEUE
+    _EVENT_QUEUE = event_queue
+    
+    
+def _queue_total_progress(percent, message):
+    _EVENT_QUEUE.put(("total", percent, message))
+    
+    
+def _queue_log_enabled(level):
+    return _LOG_LEVELS is None or level.value in _LOG_LEVELS
+    
+    
+def _queue_log(level, source, message):
+    # Entries the GUI would drop aren't worth pickling through the pipe
+    if _queue_log_enabled(level):
+        _EVENT_QUEUE.put(("log", level, source, message))
+        
+        
+# Lets level_enabled skip building those entries in the first place
+_queue_log.is_enabled = _queue_log_enabled
+
+
+def repack_task(folder_path: str, output_file: str, converter_type_value: str,
+                task_id=None, log_levels=None) -> bool:
+    """
+    Repack in a worker process
+    
+    Logs and total progress are sent as ("log", level, source, message) and
+    ("total", percent, message) tuples to the queue given to init_worker,
+    followed by ("end", task_id) once the task is done. Only logs whose
+    LogLevel value is in log_levels are sent, if it is given.
+    """
+    global _LOG_LEVELS
+    _LOG_LEVELS = None if log_levels is None else frozenset(log_levels)
+    try:
+        converter = PMPConverter()
+        return converter.repack(
+            folder_path,
+            output_file,
+            ConverterType(converter_type_value),
+            _queue_total_progress,
+            None,
+            _queue_log
+        )
+    finally:
+        _EVENT_QUEUE.put(("end", task_id))
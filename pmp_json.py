@@ -0,0 +1,37 @@
+"""
+PenguinMod File Converter - JSON Helpers
+Uses orjson when it is installed, falling back to the standard library
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is strict (no NaN/Infinity); let json have a go
+            pass
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, indented by 2 spaces if requested"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # Non-str keys, huge ints and the like; json handles them
+            pass
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    return text.encode('utf-8')
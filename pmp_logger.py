@@ -3,8 +3,9 @@ PenguinMod File Converter - Logging System
 Provides structured logging with levels and filtering
 """
 
+import logging
+import time
 from enum import Enum
-from dataclasses import dataclass
 from datetime import datetime
 from typing import Set
 
@@ -19,50 +20,110 @@ class LogLevel(Enum):
     FATAL = 6
 
 
-@dataclass
+# Matching stdlib logging levels, used when entries travel through `logging`
+STDLIB_LEVELS = {
+    LogLevel.INFO: logging.INFO,
+    LogLevel.DEBUG: logging.DEBUG,
+    LogLevel.NOTE: 25,
+    LogLevel.WARN: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.FATAL: logging.CRITICAL,
+}
+
+# Bitmask with the bit for every LogLevel set, see LogFilter
+_ALL_MASK = sum(1 << level.value for level in LogLevel)
+
+
+def level_enabled(log_cb, level: LogLevel) -> bool:
+    """Whether log_cb would keep an entry at level
+    
+    Lets hot loops skip building messages nobody will see. Callbacks can
+    expose an is_enabled(level) attribute; those without one take everything.
+    """
+    if not log_cb:
+        return False
+    is_enabled = getattr(log_cb, 'is_enabled', None)
+    return is_enabled is None or is_enabled(level)
+
+
 class LogEntry:
     """Represents a single log entry"""
-    level: LogLevel
-    source: str
-    message: str
-    timestamp: datetime = None
     
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+    __slots__ = ('level', 'source', 'message', 'ts', 'display_line', 'show', '_fmt')
+    
+    def __init__(self, level: LogLevel, source: str, message: str, ts: float = None):
+        self.level = level
+        self.source = source
+        self.message = message
+        # Seconds since the epoch, as returned by time.time()
+        self.ts = time.time() if ts is None else ts
+        # Console line, formatted once off the UI thread
+        self.display_line = None
+        # Whether the display filter allowed the entry when it was produced
+        self.show = True
+        self._fmt = None  # Cached __str__ result
+        
+    def __repr__(self):
+        return (f"LogEntry(level={self.level!r}, source={self.source!r}, "
+                f"message={self.message!r}, ts={self.ts!r})")
+        
+    def __eq__(self, other):
+        if not isinstance(other, LogEntry):
+            return NotImplemented
+        return (self.level, self.source, self.message, self.ts) == \
+            (other.level, other.source, other.message, other.ts)
+            
+    __hash__ = None
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Entry time as a datetime, built only when asked for"""
+        return datetime.fromtimestamp(self.ts)
             
     def __str__(self):
-        """Format log entry as string"""
-        timestamp = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-        return f"[{timestamp}] [{self.level.name}][{self.source}] {self.message}"
+        """Format log entry as string (computed once, then cached)"""
+        fmt = self._fmt
+        if fmt is None:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.ts))
+            fmt = self._fmt = f"[{timestamp}] [{self.level.name}][{self.source}] {self.message}"
+        return fmt
 
 
 class LogFilter:
-    """Manages log level filtering"""
+    """Manages log level filtering
+    
+    Enabled levels are kept as an int bitmask where bit `level.value` is set
+    for each enabled level, so checks are a shift and an AND.
+    """
     
     def __init__(self):
         # By default, show all log levels
-        self.enabled_levels: Set[LogLevel] = set(LogLevel)
+        self._mask = _ALL_MASK
+        
+    @property
+    def enabled_levels(self) -> Set[LogLevel]:
+        """Set of enabled levels, built on demand"""
+        return {level for level in LogLevel if (self._mask >> level.value) & 1}
         
     def set_level(self, level: LogLevel, enabled: bool):
         """Enable or disable a specific log level"""
         if enabled:
-            self.enabled_levels.add(level)
+            self._mask |= 1 << level.value
         else:
-            self.enabled_levels.discard(level)
+            self._mask &= ~(1 << level.value)
             
     def is_enabled(self, level: LogLevel) -> bool:
         """Check if a log level is enabled"""
-        return level in self.enabled_levels
+        return bool((self._mask >> level.value) & 1)
         
     def should_show(self, entry: LogEntry) -> bool:
         """Check if a log entry should be shown based on current filter"""
-        return entry.level in self.enabled_levels
+        return bool((self._mask >> entry.level.value) & 1)
         
     def enable_all(self):
         """Enable all log levels"""
-        self.enabled_levels = set(LogLevel)
+        self._mask = _ALL_MASK
         
     def disable_all(self):
         """Disable all log levels"""
-        self.enabled_levels.clear()
+        self._mask = 0
@@ -7,22 +7,364 @@ FIXES:
 - Preserves layerOrder exactly
 """
 
+import io
+import mmap
+import sys
 import zipfile
-import json
-import shutil
+import zlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable, Optional, Dict, Any, List
 
-from pmp_logger import LogLevel
+import pmp_json
+from pmp_logger import LogLevel, level_enabled
 from pmp_types import ConverterType
 
+# Faster deflate engines if installed; both write standard deflate streams
+try:
+    from zlib_ng import zlib_ng as _zlib_engine
+    _ENGINE_MAX_LEVEL = 9
+except ImportError:
+    try:
+        from isal import isal_zlib as _zlib_engine
+        _ENGINE_MAX_LEVEL = _zlib_engine.ISAL_BEST_COMPRESSION
+    except ImportError:
+        _zlib_engine = zlib
+        _ENGINE_MAX_LEVEL = 9
+
+# Write buffer for the output archive
+ARCHIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Outputs above this size may bypass the OS cache (PMPRepacker.use_direct_io)
+DIRECT_IO_THRESHOLD = 64 * 1024 * 1024
+
+# With an automatic compression level, above this much data to deflate
+# favour speed over ratio
+LARGE_DEFLATE_SIZE = 100 * 1024 * 1024
+
+# Stored assets at least this big are mapped instead of read into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+# Already-compressed formats; deflating them costs time and saves ~nothing
+STORED_SUFFIXES = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp3', '.ogg',
+    '.woff', '.woff2',
+})
+
+# Files picked up from an unpacked project's fonts folder
+FONT_SUFFIXES = frozenset({'.ttf', '.otf', '.woff', '.woff2'})
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for callbacks that weren't given"""
+
+
+# Nothing logged through the stand-in is kept, see pmp_logger.level_enabled
+_noop.is_enabled = lambda level: False
+
+
+def _auto_compresslevel(deflate_size: int) -> int:
+    """Pick a deflate level for the engine in use from the amount of data"""
+    large = deflate_size > LARGE_DEFLATE_SIZE
+    if _ENGINE_MAX_LEVEL < 9:
+        # isal: level 2 compresses about like zlib 6, much faster
+        return 1 if large else 2
+    return 1 if large else 6
+
+
+def _deflate_bytes(data: bytes, level: int):
+    """Raw-deflate data (zlib releases the GIL, so this runs in threads)
+    
+    Returns (file_size, crc32, payload).
+    """
+    # Same stream zipfile itself produces for ZIP_DEFLATED
+    compressor = _zlib_engine.compressobj(min(level, _ENGINE_MAX_LEVEL), _zlib_engine.DEFLATED, -15)
+    payload = compressor.compress(data) + compressor.flush()
+    return len(data), _zlib_engine.crc32(data), payload
+
+
+def _deflate_file(path: str, level: int):
+    """Read and raw-deflate a file, see _deflate_bytes"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return _deflate_bytes(data, level)
+
+
+def _deflate_project_json(project_data: Dict[str, Any], level: int):
+    """Serialize and raw-deflate project.json one target at a time
+    
+    Produces the same document as pmp_json.dumps(project_data), but only one
+    target's JSON is held uncompressed at a time instead of all of it.
+    Returns (file_size, crc32, payload) like _deflate_bytes.
+    """
+    compressor = _zlib_engine.compressobj(min(level, _ENGINE_MAX_LEVEL), _zlib_engine.DEFLATED, -15)
+    chunks = []
+    file_size = 0
+    crc = 0
+    
+    def feed(data: bytes):
+        nonlocal file_size, crc
+        file_size += len(data)
+        crc = _zlib_engine.crc32(data, crc)
+        chunks.append(compressor.compress(data))
+        
+    feed(b'{')
+    for idx, (key, value) in enumerate(project_data.items()):
+        feed((b',' if idx else b'') + pmp_json.dumps(key) + b':')
+        if key == 'targets' and isinstance(value, list):
+            feed(b'[')
+            for target_idx, target in enumerate(value):
+                feed((b',' if target_idx else b'') + pmp_json.dumps(target))
+            feed(b']')
+        else:
+            feed(pmp_json.dumps(value))
+    feed(b'}')
+    
+    chunks.append(compressor.flush())
+    return file_size, crc, b''.join(chunks)
+
+
+def _scan_files(directory) -> Dict[str, str]:
+    """Map the names of the regular files in a directory to their paths
+    
+    os.scandir reports the entry type from the directory listing itself on
+    most platforms, avoiding the per-file stat of Path.iterdir + is_file.
+    """
+    with os.scandir(directory) as it:
+        return {entry.name: entry.path for entry in it if entry.is_file()}
+
+
+def _load_merged_objects(paths) -> Dict[str, Any]:
+    """Load JSON object files and merge them in order, later keys winning
+    
+    The objects' bodies are spliced into a single document and parsed once.
+    If any file isn't a plain object, or the splice doesn't parse, the
+    files are parsed and merged one at a time instead.
+    """
+    raw = []
+    for path in paths:
+        with open(path, 'rb', buffering=0) as f:
+            raw.append(f.readall())
+            
+    bodies = []
+    for data in raw:
+        data = data.strip()
+        if not data:
+            continue
+        if not (data.startswith(b'{') and data.endswith(b'}')):
+            bodies = None
+            break
+        body = data[1:-1].strip()
+        if body:
+            bodies.append(body)
+            
+    if bodies is not None:
+        try:
+            return pmp_json.loads(b'{' + b','.join(bodies) + b'}')
+        except ValueError:
+            pass
+            
+    merged = {}
+    for data in raw:
+        if data.strip():
+            merged.update(pmp_json.loads(data))
+    return merged
+
+
+def _read_json(path):
+    """Load a JSON file with a single unbuffered read"""
+    with open(path, 'rb', buffering=0) as f:
+        return pmp_json.loads(f.readall())
+
+
+def _read_stored_file(path: str):
+    """Read a file for a stored (uncompressed) entry
+    
+    Returns (file_size, crc32, payload). Files of MMAP_THRESHOLD or more
+    come back as a read-only mmap, which the caller closes once written.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    return len(data), _zlib_engine.crc32(data), data
+    
+    
+def _open_direct(path) -> int:
+    """Open a file for writing that bypasses the OS page cache, returning an fd
+    
+    Raises OSError where the platform or filesystem doesn't support it.
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        import msvcrt
+        GENERIC_WRITE = 0x40000000
+        CREATE_ALWAYS = 2
+        FILE_FLAG_NO_BUFFERING = 0x20000000
+        FILE_FLAG_WRITE_THROUGH = 0x80000000
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateFileW.restype = ctypes.c_void_p
+        handle = kernel32.CreateFileW(
+            str(path), GENERIC_WRITE, 0, None, CREATE_ALWAYS,
+            FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH, None
+        )
+        if handle is None or handle == ctypes.c_void_p(-1).value:
+            raise ctypes.WinError()
+        return msvcrt.open_osfhandle(handle, os.O_WRONLY)
+        
+    if not hasattr(os, 'O_DIRECT'):
+        raise OSError("O_DIRECT is not available on this platform")
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666)
+    
+    
+class _DirectFileWriter:
+    """Write-only, non-seekable output file that bypasses the OS page cache
+    
+    Data is collected in a page-aligned buffer and written in whole blocks
+    through a direct-I/O handle. The unaligned tail is appended with a normal
+    buffered write on close, and so is everything after a rejected direct
+    write. ZipFile treats the file as unseekable, which the upfront-CRC
+    entries from _write_prepared_entry don't need anyway.
+    """
+    
+    BLOCK_SIZE = 1024 * 1024  # A multiple of every sector and page size
+    
+    def __init__(self, path):
+        self.path = path
+        self._fd = _open_direct(path)
+        self._buf = mmap.mmap(-1, self.BLOCK_SIZE)  # Anonymous maps are page aligned
+        self._view = memoryview(self._buf)
+        self._fill = 0
+        self._pos = 0
+        self._direct_written = 0
+        self._tail = None  # Buffered file used once direct writes stop
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc):
+        self.close()
+        
+    def write(self, data) -> int:
+        data = memoryview(data).cast('B')
+        size = len(data)
+        offset = 0
+        while offset < size and self._tail is None:
+            chunk = min(self.BLOCK_SIZE - self._fill, size - offset)
+            self._view[self._fill:self._fill + chunk] = data[offset:offset + chunk]
+            self._fill += chunk
+            offset += chunk
+            if self._fill == self.BLOCK_SIZE:
+                self._write_block()
+        if offset < size:
+            self._tail.write(data[offset:])
+        self._pos += size
+        return size
+        
+    def _write_block(self):
+        try:
+            written = os.write(self._fd, self._view)
+        except OSError:
+            written = -1
+        if written != self.BLOCK_SIZE:
+            # Filesystem refused direct I/O (or wrote short); redo it buffered
+            self._switch_to_buffered()
+            return
+        self._direct_written += written
+        self._fill = 0
+        
+    def _switch_to_buffered(self):
+        os.close(self._fd)
+        self._fd = None
+        tail = open(self.path, 'r+b', buffering=ARCHIVE_BUFFER_SIZE)
+        tail.seek(self._direct_written)
+        tail.truncate()
+        tail.write(self._view[:self._fill])
+        self._fill = 0
+        self._tail = tail
+        
+    def tell(self) -> int:
+        return self._pos
+        
+    def seek(self, *args):
+        raise io.UnsupportedOperation("seek")
+        
+    def flush(self):
+        if self._tail is not None:
+            self._tail.flush()
+            
+    def close(self):
+        if self._buf.closed:
+            return
+        if self._tail is None:
+            self._switch_to_buffered()
+        self._tail.close()
+        self._view.release()
+        self._buf.close()
+        
+        
+# ZipFile internals _write_prepared_entry relies on; matches CPython 3.8-3.13
+_ZIPFILE_INTERNALS = ('_lock', '_seekable', '_writecheck', '_didModify', '_writing',
+                      'start_dir', 'filelist', 'NameToInfo')
+
+
+def _write_prepared_entry(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, payload: bytes):
+    """Append an entry whose payload (deflated or stored), CRC and sizes were computed already
+    
+    Mirrors ZipFile._open_to_write/_ZipWriteFile.close without recompressing.
+    If a zipfile version lacks the internals used, the payload is inflated
+    again and handed to writestr instead.
+    """
+    if not all(hasattr(zf, name) for name in _ZIPFILE_INTERNALS):
+        if zinfo.compress_type == zipfile.ZIP_STORED:
+            data = payload
+        else:
+            data = zlib.decompress(payload, -15)
+        zf.writestr(zinfo, data, compresslevel=zf.compresslevel)
+        return
+        
+    zinfo.flag_bits = 0
+    if not zinfo.external_attr:
+        zinfo.external_attr = 0o600 << 16
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    
+    with zf._lock:
+        if zf._writing:
+            raise ValueError("Can't write to the ZIP file while there is "
+                             "another write handle open on it.")
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(payload)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+
 
 class PMPRepacker:
     """Handles repacking folder structures back to .pmp files"""
     
+    # Loader method for each format
+    _DISPATCH = {
+        ConverterType.LEGACY: '_repack_legacy',
+        ConverterType.IDEA1: '_repack_idea1',
+        ConverterType.IDEA2: '_repack_idea2',
+        ConverterType.HIDDEN: '_repack_hidden',
+    }
+    
     def __init__(self):
         self.project_data = None
-        self.assets = []
+        self.assets = {}  # Archive name -> source path
+        # Opt-in: write outputs above DIRECT_IO_THRESHOLD around the OS cache
+        self.use_direct_io = False
         
     def repack(
         self,
@@ -31,85 +373,129 @@ class PMPRepacker:
         converter_type: ConverterType,
         total_progress_cb: Optional[Callable] = None,
         item_progress_cb: Optional[Callable] = None,
-        log_cb: Optional[Callable] = None
+        log_cb: Optional[Callable] = None,
+        compresslevel: int = 0
     ) -> bool:
-        """Repack folder structure to .pmp file"""
+        """Repack folder structure to .pmp file
+        
+        Entries are deflated with zlib-ng or isal when one is installed
+        (isal caps the level at 3), otherwise with the stdlib zlib.
+        A compresslevel of 0 picks one from the amount of data to deflate.
+        """
+        # Missing callbacks become no-ops, so the helpers below call them unguarded
+        total_progress_cb = total_progress_cb or _noop
+        item_progress_cb = item_progress_cb or _noop
+        log_cb = log_cb or _noop
+        
         try:
             folder = Path(folder_path)
             
             # Step 1: Load and rebuild project data (70%)
-            if total_progress_cb:
-                total_progress_cb(0, "Loading project structure")
-            if log_cb:
-                log_cb(LogLevel.INFO, "REPACKER", "Loading project structure")
+            total_progress_cb(0, "Loading project structure")
+            log_cb(LogLevel.INFO, "REPACKER", "Loading project structure")
                 
-            if converter_type == ConverterType.LEGACY:
-                success = self._repack_legacy(folder, total_progress_cb, item_progress_cb, log_cb)
-            elif converter_type == ConverterType.IDEA1:
-                success = self._repack_idea1(folder, total_progress_cb, item_progress_cb, log_cb)
-            elif converter_type == ConverterType.IDEA2:
-                success = self._repack_idea2(folder, total_progress_cb, item_progress_cb, log_cb)
-            elif converter_type == ConverterType.HIDDEN:
-                success = self._repack_hidden(folder, total_progress_cb, item_progress_cb, log_cb)
-            else:
-                if log_cb:
-                    log_cb(LogLevel.FATAL, "REPACKER", f"Unknown converter type: {converter_type}")
+            method = getattr(self, self._DISPATCH.get(converter_type, ''), None)
+            if method is None:
+                log_cb(LogLevel.FATAL, "REPACKER", f"Unknown converter type: {converter_type}")
                 return False
                 
+            success = method(folder, total_progress_cb, item_progress_cb, log_cb)
+                
             if not success:
                 return False
                 
             # Step 2: Create ZIP archive (90%)
-            if total_progress_cb:
-                total_progress_cb(75, "Creating .pmp archive")
-            if log_cb:
-                log_cb(LogLevel.INFO, "REPACKER", "Creating .pmp archive")
-                
-            # Create temp directory for staging
-            temp_dir = Path(output_file).parent / ".temp_repack"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write project.json
-            project_json_path = temp_dir / "project.json"
-            # FIX: Use separators without spaces for compact output
-            with open(project_json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.project_data, f, ensure_ascii=False, separators=(',', ':'))
-                
-            # Copy assets
-            if total_progress_cb:
-                total_progress_cb(80, "Copying assets")
+            total_progress_cb(75, "Creating .pmp archive")
+            log_cb(LogLevel.INFO, "REPACKER", "Creating .pmp archive")
                 
-            for asset_path in self.assets:
-                if asset_path.exists():
-                    dest = temp_dir / asset_path.name
-                    shutil.copy2(asset_path, dest)
-                    if log_cb:
-                        log_cb(LogLevel.DEBUG, "REPACKER", f"Copied asset: {asset_path.name}")
+            # Archive entries by name: the project data, then asset paths
+            # (the loaders only collect files the folder listing reported)
+            entries = {"project.json": self.project_data}
+            entries.update(self.assets)
+            if level_enabled(log_cb, LogLevel.DEBUG):
+                for asset_name in self.assets:
+                    log_cb(LogLevel.DEBUG, "REPACKER", f"Adding asset: {asset_name}")
                         
             # Create ZIP with optimized compression
-            if total_progress_cb:
-                total_progress_cb(85, "Compressing archive")
+            total_progress_cb(85, "Compressing archive")
                 
-            # Use compression level 6 (balanced speed/size) instead of default 9
-            with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
-                for file_path in temp_dir.iterdir():
-                    zf.write(file_path, file_path.name)
+            if not compresslevel:
+                # project.json is serialized while it's compressed, so only
+                # asset files count
+                deflate_size = sum(
+                    os.path.getsize(src) for src in entries.values()
+                    if isinstance(src, str) and os.path.splitext(src)[1].lower() not in STORED_SUFFIXES
+                )
+                compresslevel = _auto_compresslevel(deflate_size)
+                log_cb(LogLevel.DEBUG, "REPACKER", f"Using compression level {compresslevel}")
+            
+            # Deflate (or just read) files on a thread pool and write entries in
+            # order from this thread; the window bounds how much data waits
+            workers = min(32, os.cpu_count() or 1)
+            window = workers * 2
+            pending = deque()
+            
+            def write_next():
+                name, source, compress_type, future = pending.popleft()
+                file_size, crc, payload = future.result()
+                if isinstance(source, dict):
+                    zinfo = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                else:
+                    zinfo = zipfile.ZipInfo.from_file(source, name)
+                zinfo.compress_type = compress_type
+                zinfo.file_size = file_size
+                zinfo.CRC = crc
+                zinfo.compress_size = len(payload)
+                _write_prepared_entry(zf, zinfo, payload)
+                if isinstance(payload, mmap.mmap):
+                    payload.close()
+                
+            out_fp = self._open_output(output_file, entries.values(), log_cb)
+            with out_fp, \
+                    zipfile.ZipFile(out_fp, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf, \
+                    ThreadPoolExecutor(max_workers=workers) as pool:
+                for name, source in entries.items():
+                    if isinstance(source, dict):
+                        compress_type = zipfile.ZIP_DEFLATED
+                        future = pool.submit(_deflate_project_json, source, compresslevel)
+                    elif os.path.splitext(source)[1].lower() in STORED_SUFFIXES:
+                        compress_type = zipfile.ZIP_STORED
+                        future = pool.submit(_read_stored_file, source)
+                    else:
+                        compress_type = zipfile.ZIP_DEFLATED
+                        future = pool.submit(_deflate_file, source, compresslevel)
+                    pending.append((name, source, compress_type, future))
+                    if len(pending) >= window:
+                        write_next()
+                while pending:
+                    write_next()
                     
-            # Cleanup
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            
-            if total_progress_cb:
-                total_progress_cb(100, "Complete")
-            if log_cb:
-                log_cb(LogLevel.INFO, "REPACKER", f"Created .pmp file: {output_file}")
+            total_progress_cb(100, "Complete")
+            log_cb(LogLevel.INFO, "REPACKER", f"Created .pmp file: {output_file}")
                 
             return True
             
         except Exception as e:
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", f"Repack failed: {str(e)}")
+            log_cb(LogLevel.FATAL, "REPACKER", f"Repack failed: {str(e)}")
             return False
             
+    def _open_output(self, output_file: str, sources, log_cb: Optional[Callable]):
+        """Open the output archive, bypassing the OS cache for large outputs if enabled
+        
+        sources are the entry contents: file paths, or the project data,
+        which isn't counted.
+        """
+        if self.use_direct_io:
+            input_size = sum(os.path.getsize(src) for src in sources if isinstance(src, str))
+            if input_size > DIRECT_IO_THRESHOLD:
+                try:
+                    out_fp = _DirectFileWriter(output_file)
+                    log_cb(LogLevel.DEBUG, "REPACKER", "Writing archive with direct I/O")
+                    return out_fp
+                except OSError as e:
+                    log_cb(LogLevel.DEBUG, "REPACKER", f"Direct I/O unavailable, using buffered writes: {e}")
+        return open(output_file, 'wb', buffering=ARCHIVE_BUFFER_SIZE)
+        
     def _repack_legacy(
         self,
         folder: Path,
@@ -118,28 +504,24 @@ class PMPRepacker:
         log_cb: Optional[Callable]
     ) -> bool:
         """Repack from legacy format"""
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", "Using LEGACY format")
+        log_cb(LogLevel.INFO, "REPACKER", "Using LEGACY format")
             
         # Load project.json
         project_json = folder / "project.json"
         if not project_json.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
             return False
             
-        with open(project_json, 'r', encoding='utf-8') as f:
-            self.project_data = json.load(f)
+        self.project_data = _read_json(project_json)
             
         # Collect all assets
-        self.assets = [f for f in folder.iterdir() 
-                      if f.is_file() and f.name != "project.json" and not f.name.startswith('.')]
+        with os.scandir(folder) as it:
+            self.assets = {e.name: e.path for e in it
+                           if e.name != "project.json" and not e.name.startswith('.') and e.is_file()}
                       
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", f"Loaded project with {len(self.assets)} assets")
+        log_cb(LogLevel.INFO, "REPACKER", f"Loaded project with {len(self.assets)} assets")
             
-        if total_progress_cb:
-            total_progress_cb(70, "Legacy format loaded")
+        total_progress_cb(70, "Legacy format loaded")
             
         return True
         
@@ -151,138 +533,95 @@ class PMPRepacker:
         log_cb: Optional[Callable]
     ) -> bool:
         """Repack from Idea 1 format"""
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", "Using IDEA 1 (Refined) format")
+        log_cb(LogLevel.INFO, "REPACKER", "Using IDEA 1 (Refined) format")
             
         # Load main project.json
         project_json = folder / "project.json"
         if not project_json.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
             return False
             
-        with open(project_json, 'r', encoding='utf-8') as f:
-            self.project_data = json.load(f)
+        self.project_data = _read_json(project_json)
             
         # FIX: Load target order from metadata
         metadata_path = folder / ".pmp_metadata.json"
         target_order = []
         
         if metadata_path.exists():
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                target_order = metadata.get('target_order', [])
-                if log_cb:
-                    log_cb(LogLevel.INFO, "REPACKER", f"Loaded target order from metadata: {len(target_order)} targets")
+            metadata = _read_json(metadata_path)
+            target_order = metadata.get('target_order', [])
+            log_cb(LogLevel.INFO, "REPACKER", f"Loaded target order from metadata: {len(target_order)} targets")
         else:
-            if log_cb:
-                log_cb(LogLevel.WARN, "REPACKER", "No metadata found - will attempt to preserve order from filesystem")
+            log_cb(LogLevel.WARN, "REPACKER", "No metadata found - will attempt to preserve order from filesystem")
                 
         # Load targets from sprites directory
         sprites_dir = folder / "sprites"
         if not sprites_dir.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "sprites directory not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "sprites directory not found")
             return False
             
         targets = []
-        self.assets = []
+        self.assets = {}
         
         # FIX: Use target_order from metadata if available
         if target_order:
             # Process targets in the exact order from metadata
-            for idx, target_info in enumerate(target_order):
-                folder_name = target_info['folder']
-                target_dir = sprites_dir / folder_name
-                
-                if not target_dir.exists():
-                    if log_cb:
-                        log_cb(LogLevel.ERROR, "REPACKER", f"Target folder not found: {folder_name}")
-                    continue
-                    
-                progress = 20 + int((idx / max(len(target_order), 1)) * 50)
-                if total_progress_cb:
-                    total_progress_cb(progress, f"Loading target {idx + 1}/{len(target_order)}")
-                    
-                target, sprite_assets = self._load_target_idea1(target_dir, folder_name, log_cb)
+            jobs = self._ordered_target_jobs(sprites_dir, target_order, log_cb)
+            loaded = self._load_targets_parallel(self._load_target_idea1, jobs, "target", total_progress_cb, log_cb)
+            
+            for (target_dir, folder_name), (target, sprite_assets) in zip(jobs, loaded):
                 if target:
                     targets.append(target)
-                    self.assets.extend(sprite_assets)
-                    if log_cb:
-                        log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded target in order: {target.get('name', folder_name)}")
+                    self.assets.update(sprite_assets)
+                    log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded target in order: {target.get('name', folder_name)}")
         else:
             # Fallback: Process stage first, then other sprites alphabetically
             # This is not ideal but better than random order
-            if log_cb:
-                log_cb(LogLevel.WARN, "REPACKER", "Using fallback alphabetical order - results may not match original")
+            log_cb(LogLevel.WARN, "REPACKER", "Using fallback alphabetical order - results may not match original")
                 
-            stage_dir = sprites_dir / "stage"
-            if stage_dir.exists():
-                if total_progress_cb:
-                    total_progress_cb(20, "Loading stage")
-                target, stage_assets = self._load_target_idea1(stage_dir, "stage", log_cb)
-                if target:
-                    targets.append(target)
-                    self.assets.extend(stage_assets)
-                    
-            # FIX: Sort sprite directories alphabetically for deterministic order
-            sprite_dirs = sorted([d for d in sprites_dir.iterdir() 
-                                 if d.is_dir() and d.name != "stage"],
-                                key=lambda x: x.name)
+            jobs = self._fallback_target_jobs(sprites_dir)
             
-            if log_cb:
-                log_cb(LogLevel.INFO, "REPACKER", f"Found {len(sprite_dirs)} sprite folders")
+            log_cb(LogLevel.INFO, "REPACKER", f"Found {len(jobs)} sprite folders")
                 
-            for idx, sprite_dir in enumerate(sprite_dirs):
-                progress = 20 + int((idx / max(len(sprite_dirs), 1)) * 50)
-                if total_progress_cb:
-                    total_progress_cb(progress, f"Loading sprite {idx + 1}/{len(sprite_dirs)}")
-                    
-                target, sprite_assets = self._load_target_idea1(sprite_dir, sprite_dir.name, log_cb)
+            loaded = self._load_targets_parallel(self._load_target_idea1, jobs, "sprite", total_progress_cb, log_cb)
+            
+            for target, sprite_assets in loaded:
                 if target:
                     targets.append(target)
-                    self.assets.extend(sprite_assets)
+                    self.assets.update(sprite_assets)
                     
         self.project_data['targets'] = targets
         
         # Load font files from fonts folder
         self._load_fonts(folder, log_cb)
         
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", f"Loaded {len(targets)} targets with {len(self.assets)} assets")
+        log_cb(LogLevel.INFO, "REPACKER", f"Loaded {len(targets)} targets with {len(self.assets)} assets")
             
-        if total_progress_cb:
-            total_progress_cb(70, "Idea 1 format loaded")
+        total_progress_cb(70, "Idea 1 format loaded")
             
         return True
         
-    def _load_target_idea1(self, target_dir: Path, folder_name: str, 
+    def _load_target_idea1(self, target_dir: str, folder_name: str, 
                            log_cb: Optional[Callable]) -> tuple:
         """Load a target from Idea 1 format"""
-        target_json_path = target_dir / f"{folder_name}.json"
+        target_json_path = os.path.join(target_dir, f"{folder_name}.json")
         
-        if not target_json_path.exists():
-            if log_cb:
-                log_cb(LogLevel.ERROR, "REPACKER", f"Target JSON not found: {target_json_path}")
-            return None, []
+        if not os.path.exists(target_json_path):
+            log_cb(LogLevel.ERROR, "REPACKER", f"Target JSON not found: {target_json_path}")
+            return None, {}
             
-        with open(target_json_path, 'r', encoding='utf-8') as f:
-            target = json.load(f)
+        target = _read_json(target_json_path)
             
         # Collect assets from costumes and sounds folders
-        assets = []
+        assets = {}
         
-        costumes_dir = target_dir / "costumes"
-        if costumes_dir.exists():
-            for asset_file in costumes_dir.iterdir():
-                if asset_file.is_file():
-                    assets.append(asset_file)
+        costumes_dir = os.path.join(target_dir, "costumes")
+        if os.path.exists(costumes_dir):
+            assets.update(_scan_files(costumes_dir))
                     
-        sounds_dir = target_dir / "sounds"
-        if sounds_dir.exists():
-            for asset_file in sounds_dir.iterdir():
-                if asset_file.is_file():
-                    assets.append(asset_file)
+        sounds_dir = os.path.join(target_dir, "sounds")
+        if os.path.exists(sounds_dir):
+            assets.update(_scan_files(sounds_dir))
                     
         return target, assets
         
@@ -294,160 +633,113 @@ class PMPRepacker:
         log_cb: Optional[Callable]
     ) -> bool:
         """Repack from Idea 2 format (split by top-level blocks)"""
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", "Using IDEA 2 (Precise) format")
+        log_cb(LogLevel.INFO, "REPACKER", "Using IDEA 2 (Precise) format")
             
         # Load main project.json
         project_json = folder / "project.json"
         if not project_json.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
             return False
             
-        with open(project_json, 'r', encoding='utf-8') as f:
-            self.project_data = json.load(f)
+        self.project_data = _read_json(project_json)
             
         # Load target order from metadata
         metadata_path = folder / ".pmp_metadata.json"
         target_order = []
         
         if metadata_path.exists():
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                target_order = metadata.get('target_order', [])
-                if log_cb:
-                    log_cb(LogLevel.INFO, "REPACKER", f"Loaded target order from metadata: {len(target_order)} targets")
+            metadata = _read_json(metadata_path)
+            target_order = metadata.get('target_order', [])
+            log_cb(LogLevel.INFO, "REPACKER", f"Loaded target order from metadata: {len(target_order)} targets")
         else:
-            if log_cb:
-                log_cb(LogLevel.WARN, "REPACKER", "No metadata found - will attempt to preserve order from filesystem")
+            log_cb(LogLevel.WARN, "REPACKER", "No metadata found - will attempt to preserve order from filesystem")
                 
         # Load targets from sprites directory
         sprites_dir = folder / "sprites"
         if not sprites_dir.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "sprites directory not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "sprites directory not found")
             return False
             
         targets = []
-        self.assets = []
+        self.assets = {}
         
         # Use target_order from metadata if available
         if target_order:
-            for idx, target_info in enumerate(target_order):
-                folder_name = target_info['folder']
-                target_dir = sprites_dir / folder_name
-                
-                if not target_dir.exists():
-                    if log_cb:
-                        log_cb(LogLevel.ERROR, "REPACKER", f"Target folder not found: {folder_name}")
-                    continue
-                    
-                progress = 20 + int((idx / max(len(target_order), 1)) * 50)
-                if total_progress_cb:
-                    total_progress_cb(progress, f"Loading target {idx + 1}/{len(target_order)}")
-                    
-                target, sprite_assets = self._load_target_idea2(target_dir, folder_name, log_cb)
+            jobs = self._ordered_target_jobs(sprites_dir, target_order, log_cb)
+            loaded = self._load_targets_parallel(self._load_target_idea2, jobs, "target", total_progress_cb, log_cb)
+            
+            for (target_dir, folder_name), (target, sprite_assets) in zip(jobs, loaded):
                 if target:
                     targets.append(target)
-                    self.assets.extend(sprite_assets)
-                    if log_cb:
-                        log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded target in order: {target.get('name', folder_name)}")
+                    self.assets.update(sprite_assets)
+                    log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded target in order: {target.get('name', folder_name)}")
         else:
             # Fallback: stage first, then alphabetically
-            if log_cb:
-                log_cb(LogLevel.WARN, "REPACKER", "Using fallback alphabetical order")
+            log_cb(LogLevel.WARN, "REPACKER", "Using fallback alphabetical order")
                 
-            stage_dir = sprites_dir / "stage"
-            if stage_dir.exists():
-                if total_progress_cb:
-                    total_progress_cb(20, "Loading stage")
-                target, stage_assets = self._load_target_idea2(stage_dir, "stage", log_cb)
-                if target:
-                    targets.append(target)
-                    self.assets.extend(stage_assets)
-                    
-            sprite_dirs = sorted([d for d in sprites_dir.iterdir() 
-                                 if d.is_dir() and d.name != "stage"],
-                                key=lambda x: x.name)
-            
-            for idx, sprite_dir in enumerate(sprite_dirs):
-                progress = 20 + int((idx / max(len(sprite_dirs), 1)) * 50)
-                if total_progress_cb:
-                    total_progress_cb(progress, f"Loading sprite {idx + 1}/{len(sprite_dirs)}")
-                    
-                target, sprite_assets = self._load_target_idea2(sprite_dir, sprite_dir.name, log_cb)
+            jobs = self._fallback_target_jobs(sprites_dir)
+            loaded = self._load_targets_parallel(self._load_target_idea2, jobs, "sprite", total_progress_cb, log_cb)
+            
+            for target, sprite_assets in loaded:
                 if target:
                     targets.append(target)
-                    self.assets.extend(sprite_assets)
+                    self.assets.update(sprite_assets)
                     
         self.project_data['targets'] = targets
         
         # Load font files from fonts folder
         self._load_fonts(folder, log_cb)
         
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", f"Loaded {len(targets)} targets with {len(self.assets)} assets")
+        log_cb(LogLevel.INFO, "REPACKER", f"Loaded {len(targets)} targets with {len(self.assets)} assets")
             
-        if total_progress_cb:
-            total_progress_cb(70, "Idea 2 format loaded")
+        total_progress_cb(70, "Idea 2 format loaded")
             
         return True
         
-    def _load_target_idea2(self, target_dir: Path, folder_name: str, 
+    def _load_target_idea2(self, target_dir: str, folder_name: str, 
                            log_cb: Optional[Callable]) -> tuple:
         """Load a target from Idea 2 format (with split blocks)"""
-        target_json_path = target_dir / f"{folder_name}.json"
+        target_json_path = os.path.join(target_dir, f"{folder_name}.json")
         
-        if not target_json_path.exists():
-            if log_cb:
-                log_cb(LogLevel.ERROR, "REPACKER", f"Target JSON not found: {target_json_path}")
-            return None, []
+        if not os.path.exists(target_json_path):
+            log_cb(LogLevel.ERROR, "REPACKER", f"Target JSON not found: {target_json_path}")
+            return None, {}
             
-        with open(target_json_path, 'r', encoding='utf-8') as f:
-            target = json.load(f)
+        target = _read_json(target_json_path)
             
         # Load blocks from code directory
-        code_dir = target_dir / "code"
-        if code_dir.exists():
-            all_blocks = {}
-            
+        code_dir = os.path.join(target_dir, "code")
+        if os.path.exists(code_dir):
             # Read all block files
-            for block_file in code_dir.iterdir():
-                if block_file.is_file() and block_file.name.startswith('block-') and block_file.name.endswith('.json'):
-                    with open(block_file, 'r', encoding='utf-8') as f:
-                        blocks_data = json.load(f)
-                        all_blocks.update(blocks_data)
-                        
+            with os.scandir(code_dir) as it:
+                block_files = [e.path for e in it
+                               if e.name.startswith('block-') and e.name.endswith('.json') and e.is_file()]
+                               
+            all_blocks = _load_merged_objects(block_files)
+            
             # CRITICAL FIX: Load detached blocks (including non-dict custom extension blocks)
-            detached_file = code_dir / "detached_blocks.json"
-            if detached_file.exists():
-                with open(detached_file, 'r', encoding='utf-8') as f:
-                    detached_data = json.load(f)
-                    all_blocks.update(detached_data)
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "REPACKER", f"Restored {len(detached_data)} detached/non-dict blocks")
-                        
+            detached_file = os.path.join(code_dir, "detached_blocks.json")
+            if os.path.exists(detached_file):
+                detached_data = _read_json(detached_file)
+                all_blocks.update(detached_data)
+                log_cb(LogLevel.DEBUG, "REPACKER", f"Restored {len(detached_data)} detached/non-dict blocks")
+                    
             target['blocks'] = all_blocks
             
-            if log_cb:
-                log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded {len(all_blocks)} blocks for {folder_name}")
+            log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded {len(all_blocks)} blocks for {folder_name}")
         else:
             target['blocks'] = {}
             
         # Collect assets
-        assets = []
+        assets = {}
         
-        costumes_dir = target_dir / "costumes"
-        if costumes_dir.exists():
-            for asset_file in costumes_dir.iterdir():
-                if asset_file.is_file():
-                    assets.append(asset_file)
+        costumes_dir = os.path.join(target_dir, "costumes")
+        if os.path.exists(costumes_dir):
+            assets.update(_scan_files(costumes_dir))
                     
-        sounds_dir = target_dir / "sounds"
-        if sounds_dir.exists():
-            for asset_file in sounds_dir.iterdir():
-                if asset_file.is_file():
-                    assets.append(asset_file)
+        sounds_dir = os.path.join(target_dir, "sounds")
+        if os.path.exists(sounds_dir):
+            assets.update(_scan_files(sounds_dir))
                     
         return target, assets
         
@@ -459,188 +751,194 @@ class PMPRepacker:
         log_cb: Optional[Callable]
     ) -> bool:
         """Repack from Hidden format (individual block files)"""
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", "Using HIDDEN (Insane) format")
+        log_cb(LogLevel.INFO, "REPACKER", "Using HIDDEN (Insane) format")
             
         # Load main project.json
         project_json = folder / "project.json"
         if not project_json.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "project.json not found")
             return False
             
-        with open(project_json, 'r', encoding='utf-8') as f:
-            self.project_data = json.load(f)
+        self.project_data = _read_json(project_json)
             
         # Load target order from metadata
         metadata_path = folder / ".pmp_metadata.json"
         target_order = []
         
         if metadata_path.exists():
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                target_order = metadata.get('target_order', [])
-                if log_cb:
-                    log_cb(LogLevel.INFO, "REPACKER", f"Loaded target order from metadata: {len(target_order)} targets")
+            metadata = _read_json(metadata_path)
+            target_order = metadata.get('target_order', [])
+            log_cb(LogLevel.INFO, "REPACKER", f"Loaded target order from metadata: {len(target_order)} targets")
         else:
-            if log_cb:
-                log_cb(LogLevel.WARN, "REPACKER", "No metadata found")
+            log_cb(LogLevel.WARN, "REPACKER", "No metadata found")
                 
         # Load targets from sprites directory
         sprites_dir = folder / "sprites"
         if not sprites_dir.exists():
-            if log_cb:
-                log_cb(LogLevel.FATAL, "REPACKER", "sprites directory not found")
+            log_cb(LogLevel.FATAL, "REPACKER", "sprites directory not found")
             return False
             
         targets = []
-        self.assets = []
+        self.assets = {}
         
         # Use target_order from metadata if available
         if target_order:
-            for idx, target_info in enumerate(target_order):
-                folder_name = target_info['folder']
-                target_dir = sprites_dir / folder_name
-                
-                if not target_dir.exists():
-                    if log_cb:
-                        log_cb(LogLevel.ERROR, "REPACKER", f"Target folder not found: {folder_name}")
-                    continue
-                    
-                progress = 20 + int((idx / max(len(target_order), 1)) * 50)
-                if total_progress_cb:
-                    total_progress_cb(progress, f"Loading target {idx + 1}/{len(target_order)}")
-                    
-                target, sprite_assets = self._load_target_hidden(target_dir, folder_name, log_cb)
+            jobs = self._ordered_target_jobs(sprites_dir, target_order, log_cb)
+            loaded = self._load_targets_parallel(self._load_target_hidden, jobs, "target", total_progress_cb, log_cb)
+            
+            for (target_dir, folder_name), (target, sprite_assets) in zip(jobs, loaded):
                 if target:
                     targets.append(target)
-                    self.assets.extend(sprite_assets)
-                    if log_cb:
-                        log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded target in order: {target.get('name', folder_name)}")
+                    self.assets.update(sprite_assets)
+                    log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded target in order: {target.get('name', folder_name)}")
         else:
             # Fallback
-            if log_cb:
-                log_cb(LogLevel.WARN, "REPACKER", "Using fallback alphabetical order")
+            log_cb(LogLevel.WARN, "REPACKER", "Using fallback alphabetical order")
                 
-            stage_dir = sprites_dir / "stage"
-            if stage_dir.exists():
-                if total_progress_cb:
-                    total_progress_cb(20, "Loading stage")
-                target, stage_assets = self._load_target_hidden(stage_dir, "stage", log_cb)
-                if target:
-                    targets.append(target)
-                    self.assets.extend(stage_assets)
-                    
-            sprite_dirs = sorted([d for d in sprites_dir.iterdir() 
-                                 if d.is_dir() and d.name != "stage"],
-                                key=lambda x: x.name)
-            
-            for idx, sprite_dir in enumerate(sprite_dirs):
-                progress = 20 + int((idx / max(len(sprite_dirs), 1)) * 50)
-                if total_progress_cb:
-                    total_progress_cb(progress, f"Loading sprite {idx + 1}/{len(sprite_dirs)}")
-                    
-                target, sprite_assets = self._load_target_hidden(sprite_dir, sprite_dir.name, log_cb)
+            jobs = self._fallback_target_jobs(sprites_dir)
+            loaded = self._load_targets_parallel(self._load_target_hidden, jobs, "sprite", total_progress_cb, log_cb)
+            
+            for target, sprite_assets in loaded:
                 if target:
                     targets.append(target)
-                    self.assets.extend(sprite_assets)
+                    self.assets.update(sprite_assets)
                     
         self.project_data['targets'] = targets
         
         # Load font files from fonts folder
         self._load_fonts(folder, log_cb)
         
-        if log_cb:
-            log_cb(LogLevel.INFO, "REPACKER", f"Loaded {len(targets)} targets with {len(self.assets)} assets")
+        log_cb(LogLevel.INFO, "REPACKER", f"Loaded {len(targets)} targets with {len(self.assets)} assets")
             
-        if total_progress_cb:
-            total_progress_cb(70, "Hidden format loaded")
+        total_progress_cb(70, "Hidden format loaded")
             
         return True
         
-    def _load_target_hidden(self, target_dir: Path, folder_name: str, 
+    def _load_target_hidden(self, target_dir: str, folder_name: str, 
                             log_cb: Optional[Callable]) -> tuple:
         """Load a target from Hidden format (individual block files)"""
-        target_json_path = target_dir / f"{folder_name}.json"
+        target_json_path = os.path.join(target_dir, f"{folder_name}.json")
         
-        if not target_json_path.exists():
-            if log_cb:
-                log_cb(LogLevel.ERROR, "REPACKER", f"Target JSON not found: {target_json_path}")
-            return None, []
+        if not os.path.exists(target_json_path):
+            log_cb(LogLevel.ERROR, "REPACKER", f"Target JSON not found: {target_json_path}")
+            return None, {}
             
-        with open(target_json_path, 'r', encoding='utf-8') as f:
-            target = json.load(f)
+        target = _read_json(target_json_path)
             
         # Load blocks from code directory
-        code_dir = target_dir / "code"
-        if code_dir.exists():
-            all_blocks = {}
-            
+        code_dir = os.path.join(target_dir, "code")
+        if os.path.exists(code_dir):
             # Read all parent folders
-            for parent_dir in code_dir.iterdir():
-                if parent_dir.is_dir() and parent_dir.name.startswith('parent_'):
-                    # Read parent block
-                    for block_file in parent_dir.iterdir():
-                        if block_file.name.startswith('parent_') and block_file.name.endswith('.json'):
-                            with open(block_file, 'r', encoding='utf-8') as f:
-                                parent_data = json.load(f)
-                                all_blocks.update(parent_data)
+            with os.scandir(code_dir) as it:
+                parent_dirs = [e.path for e in it if e.name.startswith('parent_') and e.is_dir()]
+                
+            # Each holds a parent block file and its child block files
+            # (or one children.json when the children were packed)
+            block_files = []
+            for parent_dir in parent_dirs:
+                with os.scandir(parent_dir) as it:
+                    block_files.extend(e.path for e in it
+                                       if (e.name.startswith(('parent_', 'child_')) and e.name.endswith('.json'))
+                                       or e.name == 'children.json')
+                                       
+            all_blocks = _load_merged_objects(block_files)
                                 
-                        # Read child blocks
-                        elif block_file.name.startswith('child_') and block_file.name.endswith('.json'):
-                            with open(block_file, 'r', encoding='utf-8') as f:
-                                child_data = json.load(f)
-                                all_blocks.update(child_data)
-                        
             # CRITICAL FIX: Load detached blocks (including non-dict custom extension blocks)
-            detached_file = code_dir / "detached_blocks.json"
-            if detached_file.exists():
-                with open(detached_file, 'r', encoding='utf-8') as f:
-                    detached_data = json.load(f)
-                    all_blocks.update(detached_data)
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "REPACKER", f"Restored {len(detached_data)} detached/non-dict blocks")
-                        
+            detached_file = os.path.join(code_dir, "detached_blocks.json")
+            if os.path.exists(detached_file):
+                detached_data = _read_json(detached_file)
+                all_blocks.update(detached_data)
+                log_cb(LogLevel.DEBUG, "REPACKER", f"Restored {len(detached_data)} detached/non-dict blocks")
+                    
             target['blocks'] = all_blocks
             
-            if log_cb:
-                log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded {len(all_blocks)} blocks for {folder_name}")
+            log_cb(LogLevel.DEBUG, "REPACKER", f"Loaded {len(all_blocks)} blocks for {folder_name}")
         else:
             target['blocks'] = {}
             
         # Collect assets
-        assets = []
+        assets = {}
         
-        costumes_dir = target_dir / "costumes"
-        if costumes_dir.exists():
-            for asset_file in costumes_dir.iterdir():
-                if asset_file.is_file():
-                    assets.append(asset_file)
+        costumes_dir = os.path.join(target_dir, "costumes")
+        if os.path.exists(costumes_dir):
+            assets.update(_scan_files(costumes_dir))
                     
-        sounds_dir = target_dir / "sounds"
-        if sounds_dir.exists():
-            for asset_file in sounds_dir.iterdir():
-                if asset_file.is_file():
-                    assets.append(asset_file)
+        sounds_dir = os.path.join(target_dir, "sounds")
+        if os.path.exists(sounds_dir):
+            assets.update(_scan_files(sounds_dir))
                     
         return target, assets
         
+    def _ordered_target_jobs(self, sprites_dir: Path, target_order: List[Dict],
+                             log_cb: Optional[Callable]) -> List[tuple]:
+        """Build (target_dir, folder_name) pairs in metadata order, skipping missing folders"""
+        sprites_str = str(sprites_dir)
+        jobs = []
+        for target_info in target_order:
+            folder_name = target_info['folder']
+            target_dir = os.path.join(sprites_str, folder_name)
+            
+            if not os.path.exists(target_dir):
+                log_cb(LogLevel.ERROR, "REPACKER", f"Target folder not found: {folder_name}")
+                continue
+                
+            jobs.append((target_dir, folder_name))
+        return jobs
+        
+    def _fallback_target_jobs(self, sprites_dir: Path) -> List[tuple]:
+        """Build (target_dir, folder_name) pairs: stage first, then sprites alphabetically"""
+        jobs = []
+        stage_dir = os.path.join(sprites_dir, "stage")
+        if os.path.exists(stage_dir):
+            jobs.append((stage_dir, "stage"))
+            
+        # FIX: Sort sprite directories alphabetically for deterministic order
+        with os.scandir(sprites_dir) as it:
+            sprite_dirs = sorted([e for e in it if e.name != "stage" and e.is_dir()],
+                                 key=lambda e: e.name)
+        jobs.extend((e.path, e.name) for e in sprite_dirs)
+        return jobs
+        
+    def _load_targets_parallel(
+        self,
+        loader: Callable,
+        jobs: List[tuple],
+        label: str,
+        total_progress_cb: Optional[Callable],
+        log_cb: Optional[Callable]
+    ) -> List[tuple]:
+        """Run loader over (target_dir, folder_name) jobs on a thread pool, keeping job order"""
+        if not jobs:
+            return []
+            
+        # Loading is mostly file reads, so use more threads than cores
+        workers = min(32, (os.cpu_count() or 1) * 4, len(jobs))
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(loader, target_dir, folder_name, log_cb)
+                       for target_dir, folder_name in jobs]
+                       
+            for idx, future in enumerate(futures):
+                progress = 20 + int((idx / len(jobs)) * 50)
+                total_progress_cb(progress, f"Loading {label} {idx + 1}/{len(jobs)}")
+                results.append(future.result())
+                
+        return results
+        
     def _load_fonts(self, folder: Path, log_cb: Optional[Callable]):
         """Load font files from fonts folder and add to assets"""
         fonts_dir = folder / "fonts"
         
         if not fonts_dir.exists():
-            if log_cb:
-                log_cb(LogLevel.DEBUG, "FONTS", "No fonts folder found")
+            log_cb(LogLevel.DEBUG, "FONTS", "No fonts folder found")
             return
             
         font_count = 0
-        for font_file in fonts_dir.iterdir():
-            if font_file.is_file() and font_file.suffix in ['.ttf', '.otf', '.woff', '.woff2']:
-                self.assets.append(font_file)
+        for font_name, font_file in _scan_files(fonts_dir).items():
+            if os.path.splitext(font_name)[1].lower() in FONT_SUFFIXES:
+                self.assets[font_name] = font_file
                 font_count += 1
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "FONTS", f"Loaded font file: {font_file.name}")
+                log_cb(LogLevel.DEBUG, "FONTS", f"Loaded font file: {font_name}")
                     
-        if log_cb and font_count > 0:
+        if font_count > 0:
             log_cb(LogLevel.INFO, "FONTS", f"Loaded {font_count} font files from fonts folder")
@@ -6,33 +6,165 @@ FIXES:
 - Properly handles customFonts
 """
 
+import errno
+import os
+import struct
+import sys
+import threading
 import zipfile
-import json
 import shutil
+import stat
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Optional, Dict, Any, List
+from typing import BinaryIO, Callable, Optional, Dict, Any, List
+import functools
 import hashlib
 import re
 
-from pmp_logger import LogLevel
+import pmp_json
+from pmp_logger import LogLevel, level_enabled
 from pmp_types import ConverterType
 
 
+# Top-level project.json keys the folder formats store explicitly
+_KNOWN_TOP_KEYS = frozenset({
+    'meta', 'extensions', 'extensionURLs', 'extensionData', 'monitors', 'customFonts', 'targets',
+})
+
+# Leading characters of a (sanitized) block ID used in block file and folder
+# names; long enough that random 20-char IDs rarely need a _N suffix
+_SHORT_ID_LENGTH = 8
+
+# Invalid Windows filename characters (and % itself) -> URL escapes
+_BLOCK_ID_ESCAPES = str.maketrans({c: f'%{ord(c):02X}' for c in '%*?<>:"/\\|'})
+
+# '//' becomes '_'; other unsafe characters are dropped
+_FOLDER_UNSAFE_RE = re.compile(r'//|[<>:"/\\|?*]')
+
+
+def _folder_unsafe_repl(match) -> str:
+    return '_' if match.group() == '//' else ''
+
+
+# Sprite names and block IDs repeat a lot (metadata, folders, child blocks),
+# so the sanitizers are memoized; unpack() clears them when it finishes
+@functools.lru_cache(maxsize=65536)
+def _sanitize_folder_name_cached(name: str) -> str:
+    """Memoized body of PMPUnpacker._sanitize_folder_name"""
+    # Replace // with _ to preserve folder structure info while being filesystem-safe,
+    # and remove other unsafe characters (one pass)
+    safe_name = _FOLDER_UNSAFE_RE.sub(_folder_unsafe_repl, name)
+    # Trim and remove trailing dots/spaces
+    safe_name = safe_name.strip('. ')
+    return safe_name if safe_name else 'sprite'
+
+
+@functools.lru_cache(maxsize=65536)
+def _sanitize_block_id_cached(block_id: str) -> str:
+    """Memoized body of PMPUnpacker._sanitize_block_id"""
+    # URL encode invalid Windows filename characters in one pass; % is encoded
+    # alongside the rest, so nothing is double-encoded
+    return block_id.translate(_BLOCK_ID_ESCAPES)
+
+
+# Linux can sendfile() between regular files, so stored members skip userspace
+_SENDFILE = sys.platform.startswith('linux') and hasattr(os, 'sendfile')
+
+# os.link failures that mean "this filesystem can't link here", so copy instead
+_LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EACCES, errno.EMLINK, errno.EINVAL,
+                     errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+def _sendfile_member(src_fd: int, info: zipfile.ZipInfo, dest) -> bool:
+    """Copy a stored (uncompressed) member straight from the archive to dest
+    
+    Returns False if the member can't be copied this way (compressed,
+    encrypted, odd header or the kernel refuses); the caller then extracts
+    it normally, overwriting whatever was written.
+    """
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return False
+    header = os.pread(src_fd, zipfile.sizeFileHeader, info.header_offset)
+    if len(header) != zipfile.sizeFileHeader or header[:4] != zipfile.stringFileHeader:
+        return False
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    offset = info.header_offset + zipfile.sizeFileHeader + name_len + extra_len
+    remaining = info.file_size
+    try:
+        with open(dest, 'wb') as dst:
+            out_fd = dst.fileno()
+            while remaining:
+                sent = os.sendfile(out_fd, src_fd, offset, remaining)
+                if not sent:
+                    return False  # Archive is shorter than the member claims
+                offset += sent
+                remaining -= sent
+    except OSError:
+        return False
+    return True
+
+
+def _write_json(path, obj):
+    """Write obj as 2-space indented UTF-8 JSON"""
+    with open(path, 'wb') as f:
+        f.write(pmp_json.dumps(obj, indent=True))
+
+
+def _is_reparse_point(entry) -> bool:
+    """Windows junctions and links must be removed, never descended into"""
+    st = entry.stat(follow_symlinks=False)
+    return bool(getattr(st, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _unlink(path):
+    """Remove a file or link, clearing the read-only flag Windows refuses to delete through"""
+    try:
+        os.unlink(path)
+    except PermissionError:
+        if os.name != 'nt':
+            raise
+        if os.path.isdir(path):
+            os.rmdir(path)  # Directory junction/symlink: drop the link only
+        else:
+            os.chmod(path, stat.S_IWRITE)
+            os.unlink(path)
+
+
+def _scandir_rmtree(path):
+    """Delete a directory tree using the DirEntry type info (no per-entry Path or extra stat)"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False) and not _is_reparse_point(entry):
+                _scandir_rmtree(entry.path)
+            else:
+                _unlink(entry.path)
+    os.rmdir(path)
+
+
 class PMPUnpacker:
     """Handles unpacking .pmp files into folder structures"""
     
     def __init__(self):
         self.project_data = None
-        self.temp_extract_dir = None
+        # Hidden format: write each stack's children to one children.json
+        # instead of a child_*.json per block (far fewer files)
+        self.pack_hidden_children = False
+        self._zf = None  # The open archive while unpacking
+        self._root_members = set()  # Names of the files at the archive root
+        self._extract_jobs = {}  # Member name -> destination paths (ordered)
+        self._json_jobs = {}  # Path -> (path, object to write there as JSON)
+        self._target_order = []  # Metadata entries of the targets, in project order
+        self._created_dirs = set()  # Output folders made so far, see _make_dir
+        self._dir_case_keys = {}  # Casefolded output folder -> first spelling made
+        self._claimed_paths = set()  # Casefolded paths handed out by _unused_path or scheduled
+        self._name_counters = {}  # Casefolded directory/stem -> next suffix to try
         
     def _cleanup_output_directory(self, output_dir: str, log_cb: Optional[Callable]):
         """Clean up existing output directory to avoid duplicate/orphaned files"""
-        import shutil
-        
-        output_path = Path(output_dir)
-        
         # If output directory doesn't exist, nothing to clean
-        if not output_path.exists():
+        if not os.path.isdir(output_dir):
             if log_cb:
                 log_cb(LogLevel.DEBUG, "CLEANUP", f"Output directory doesn't exist yet: {output_dir}")
             return
@@ -44,15 +176,12 @@ class PMPUnpacker:
         files_to_delete = []
         dirs_to_delete = []
         
-        for item in output_path.iterdir():
-            # Skip the temp extraction directory
-            if item.name == ".temp_extract":
-                continue
-                
-            if item.is_file():
-                files_to_delete.append(item)
-            elif item.is_dir():
-                dirs_to_delete.append(item)
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and not _is_reparse_point(entry):
+                    dirs_to_delete.append(entry.path)
+                else:
+                    files_to_delete.append(entry.path)
         
         if not files_to_delete and not dirs_to_delete:
             if log_cb:
@@ -60,32 +189,50 @@ class PMPUnpacker:
             return
         
         # Log what will be deleted
-        total_items = len(files_to_delete) + len(dirs_to_delete)
+        file_count = len(files_to_delete)
+        dir_count = len(dirs_to_delete)
+        total_items = file_count + dir_count
         if log_cb:
             log_cb(LogLevel.WARN, "CLEANUP", f"Deleting {total_items} items from output directory to avoid duplicates")
         
+        # One rm for the whole tree on POSIX; anything it leaves behind goes through the walker
+        if os.name == 'posix':
+            try:
+                subprocess.run(
+                    ["rm", "-rf", "--", *files_to_delete, *dirs_to_delete],
+                    check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+                )
+            except (OSError, subprocess.CalledProcessError) as e:
+                if log_cb:
+                    log_cb(LogLevel.DEBUG, "CLEANUP", f"rm failed, deleting in-process: {e}")
+                files_to_delete = [p for p in files_to_delete if os.path.lexists(p)]
+                dirs_to_delete = [p for p in dirs_to_delete if os.path.lexists(p)]
+            else:
+                files_to_delete = dirs_to_delete = ()
+                
         # Delete files
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
         for file_path in files_to_delete:
             try:
-                file_path.unlink()
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "CLEANUP", f"Deleted file: {file_path.name}")
+                _unlink(file_path)
+                if debug_cb:
+                    debug_cb(LogLevel.DEBUG, "CLEANUP", f"Deleted file: {os.path.basename(file_path)}")
             except Exception as e:
                 if log_cb:
-                    log_cb(LogLevel.ERROR, "CLEANUP", f"Failed to delete file {file_path.name}: {e}")
+                    log_cb(LogLevel.ERROR, "CLEANUP", f"Failed to delete file {os.path.basename(file_path)}: {e}")
         
         # Delete directories
         for dir_path in dirs_to_delete:
             try:
-                shutil.rmtree(dir_path)
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "CLEANUP", f"Deleted directory: {dir_path.name}")
+                _scandir_rmtree(dir_path)
+                if debug_cb:
+                    debug_cb(LogLevel.DEBUG, "CLEANUP", f"Deleted directory: {os.path.basename(dir_path)}")
             except Exception as e:
                 if log_cb:
-                    log_cb(LogLevel.ERROR, "CLEANUP", f"Failed to delete directory {dir_path.name}: {e}")
+                    log_cb(LogLevel.ERROR, "CLEANUP", f"Failed to delete directory {os.path.basename(dir_path)}: {e}")
         
         if log_cb:
-            log_cb(LogLevel.INFO, "CLEANUP", f"✓ Cleanup complete - removed {len(files_to_delete)} files and {len(dirs_to_delete)} directories")
+            log_cb(LogLevel.INFO, "CLEANUP", f"✓ Cleanup complete - removed {file_count} files and {dir_count} directories")
         
     def unpack(
         self,
@@ -94,25 +241,39 @@ class PMPUnpacker:
         converter_type: ConverterType,
         total_progress_cb: Optional[Callable] = None,
         item_progress_cb: Optional[Callable] = None,
-        log_cb: Optional[Callable] = None
+        log_cb: Optional[Callable] = None,
+        pmp_fileobj: Optional[BinaryIO] = None
     ) -> bool:
-        """Unpack .pmp file to folder structure"""
+        """Unpack .pmp file to folder structure
+        
+        pmp_fileobj, if given, is an open binary handle on pmp_file that is
+        read instead of reopening the path.
+        
+        Members are streamed from the archive straight to their place in
+        the output folder; nothing is extracted to a temporary folder.
+        """
         try:
-            # Step 1: Extract ZIP (10%)
+            # Step 1: Open ZIP (10%)
             if total_progress_cb:
-                total_progress_cb(0, "Extracting .pmp archive")
+                total_progress_cb(0, "Opening .pmp archive")
             if log_cb:
-                log_cb(LogLevel.INFO, "UNPACKER", "Extracting .pmp archive")
+                log_cb(LogLevel.INFO, "UNPACKER", "Opening .pmp archive")
                 
-            temp_dir = Path(output_dir) / ".temp_extract"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            self.temp_extract_dir = temp_dir
+            self._extract_jobs = {}
+            self._json_jobs = {}
+            self._target_order = []
+            self._created_dirs = set()
+            self._dir_case_keys = {}
+            self._claimed_paths = set()
+            self._name_counters = {}
+            self._zf = zipfile.ZipFile(pmp_fileobj if pmp_fileobj is not None else pmp_file, 'r')
+            self._root_members = {
+                info.filename for info in self._zf.infolist()
+                if not info.is_dir() and '/' not in info.filename and info.filename not in ('.', '..')
+            }
             
-            with zipfile.ZipFile(pmp_file, 'r') as zf:
-                zf.extractall(temp_dir)
-                
             if total_progress_cb:
-                total_progress_cb(10, "Archive extracted")
+                total_progress_cb(10, "Archive opened")
                 
             # Step 2: Load project.json (20%)
             if total_progress_cb:
@@ -120,14 +281,12 @@ class PMPUnpacker:
             if log_cb:
                 log_cb(LogLevel.INFO, "UNPACKER", "Loading project.json")
                 
-            project_json_path = temp_dir / "project.json"
-            if not project_json_path.exists():
+            if "project.json" not in self._root_members:
                 if log_cb:
                     log_cb(LogLevel.FATAL, "UNPACKER", "project.json not found in archive")
                 return False
                 
-            with open(project_json_path, 'r', encoding='utf-8') as f:
-                self.project_data = json.load(f)
+            self.project_data = pmp_json.loads(self._zf.read("project.json"))
                 
             if total_progress_cb:
                 total_progress_cb(20, "Project data loaded")
@@ -136,6 +295,7 @@ class PMPUnpacker:
             if total_progress_cb:
                 total_progress_cb(22, "Preparing output directory")
             self._cleanup_output_directory(output_dir, log_cb)
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
                 
             # Step 3: Organize based on converter type (80%)
             if converter_type == ConverterType.LEGACY:
@@ -151,33 +311,37 @@ class PMPUnpacker:
                     log_cb(LogLevel.FATAL, "UNPACKER", f"Unknown converter type: {converter_type}")
                 return False
                 
+            # Write out the assets and JSON files the format handler scheduled
+            if success:
+                self._run_write_jobs(pmp_file, total_progress_cb, log_cb)
+                
             # Step 4: Cleanup and metadata
             if success:
                 if total_progress_cb:
                     total_progress_cb(95, "Writing metadata")
                     
                 # Write metadata file for repacking
-                # FIX: Include target order information
-                targets = self.project_data.get('targets', [])
-                target_order = []
-                for target in targets:
-                    is_stage = target.get('isStage', False)
-                    target_name = target.get('name', 'unknown')
-                    folder_name = "stage" if is_stage else self._sanitize_folder_name(target_name)
-                    target_order.append({
-                        'folder': folder_name,
-                        'name': target_name,
-                        'isStage': is_stage
-                    })
-                
+                # FIX: Include target order information (the folder formats record
+                # it while laying out the targets; Legacy has no target folders)
+                target_order = self._target_order
+                if not target_order:
+                    for target in self.project_data.get('targets', []):
+                        is_stage = target.get('isStage', False)
+                        target_name = target.get('name', 'unknown')
+                        folder_name = "stage" if is_stage else self._sanitize_folder_name(target_name)
+                        target_order.append({
+                            'folder': folder_name,
+                            'name': target_name,
+                            'isStage': is_stage
+                        })
+                        
                 metadata = {
                     'converter_type': converter_type.value,
                     'original_file': Path(pmp_file).name,
                     'target_order': target_order  # FIX: Save original order
                 }
                 metadata_path = Path(output_dir) / ".pmp_metadata.json"
-                with open(metadata_path, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, indent=2)
+                _write_json(metadata_path, metadata)
                     
                 if log_cb:
                     log_cb(LogLevel.DEBUG, "UNPACKER", f"Saved metadata with {len(target_order)} targets in order")
@@ -185,10 +349,6 @@ class PMPUnpacker:
                 if total_progress_cb:
                     total_progress_cb(100, "Complete")
                     
-            # Cleanup temp directory
-            if self.temp_extract_dir and self.temp_extract_dir.exists():
-                shutil.rmtree(self.temp_extract_dir, ignore_errors=True)
-                
             return success
             
         except Exception as e:
@@ -199,15 +359,135 @@ class PMPUnpacker:
                 log_cb(LogLevel.DEBUG, "UNPACKER", f"Traceback:\n{error_details}")
             return False
             
+        finally:
+            if self._zf is not None:
+                self._zf.close()
+                self._zf = None
+            # The converter keeps this unpacker around; don't hold the parsed project between runs
+            self.project_data = None
+            self._extract_jobs = {}
+            self._json_jobs = {}
+            self._target_order = []
+            self._created_dirs = set()
+            self._dir_case_keys = {}
+            self._claimed_paths = set()
+            self._name_counters = {}
+            _sanitize_folder_name_cached.cache_clear()
+            _sanitize_block_id_cached.cache_clear()
+                
+    def _extract_member(self, name: str, dest: Path):
+        """Stream one archive member to dest"""
+        with self._zf.open(name) as src, open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+            
+    def _queue_extract(self, name: str, dest: str):
+        """Schedule an archive member to be written to dest by _run_extract_jobs"""
+        self._extract_jobs.setdefault(name, {})[dest] = None
+        
+    def _queue_json(self, path, obj):
+        """Schedule obj to be written to path as JSON by _run_write_jobs
+        
+        Scheduling the same path again replaces the object, like rewriting
+        the file would. Paths that only differ in case are separate files
+        here; _make_dir warns where they would meet on Windows or macOS.
+        """
+        path_str = str(path)
+        self._json_jobs[path_str] = (path, obj)
+        self._claimed_paths.add(path_str.casefold())
+        
+    def _unused_path(self, directory, stem: str, suffix: str = '') -> str:
+        """directory/stem+suffix, or stem_1, stem_2, ... if that name is already taken
+        
+        Nothing is on disk yet while the handlers run, so names are checked
+        against what this unpack has claimed or scheduled, case-insensitively
+        so no two names meet on Windows or macOS. Each stem remembers where its numbering got to, so
+        many blocks sharing a prefix don't rescan all earlier suffixes.
+        Returns a plain string path; this runs once per block in Hidden mode.
+        """
+        directory = os.fspath(directory)
+        base = os.path.join(directory, stem).casefold()
+        counter = self._name_counters.get(base, 0)
+        while True:
+            name = f"{stem}{suffix}" if counter == 0 else f"{stem}_{counter}{suffix}"
+            path = os.path.join(directory, name)
+            key = path.casefold()
+            counter += 1
+            if key not in self._claimed_paths:
+                break
+        self._name_counters[base] = counter
+        self._claimed_paths.add(key)
+        return path
+        
+    def _run_write_jobs(self, pmp_file: str, total_progress_cb: Optional[Callable],
+                        log_cb: Optional[Callable]):
+        """Write all scheduled members and JSON files on one thread pool
+        
+        Each worker thread reads through its own ZipFile handle on pmp_file;
+        stored members are copied with os.sendfile where available. A member needed in several places (a costume shared by sprites) is
+        inflated once and hard-linked to the other destinations, or copied
+        where the filesystem can't link.
+        """
+        jobs = list(self._extract_jobs.items())
+        json_jobs = list(self._json_jobs.values())
+        self._extract_jobs = {}
+        self._json_jobs = {}
+        if not jobs and not json_jobs:
+            return
+            
+        if total_progress_cb:
+            total_progress_cb(90, f"Extracting {len(jobs)} assets")
+        if log_cb:
+            log_cb(LogLevel.DEBUG, "ASSET_MGR", f"Extracting {len(jobs)} archive members, writing {len(json_jobs)} JSON files")
+            
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+        # pread/sendfile take explicit offsets, so the workers can share one fd
+        src_fd = os.open(pmp_file, os.O_RDONLY) if _SENDFILE and jobs else None
+        
+        def extract(job):
+            name, dests = job
+            first, *rest = dests
+            if src_fd is None or not _sendfile_member(src_fd, self._zf.getinfo(name), first):
+                zf = getattr(local, 'zf', None)
+                if zf is None:
+                    zf = local.zf = zipfile.ZipFile(pmp_file, 'r')
+                    with handles_lock:
+                        handles.append(zf)
+                with zf.open(name) as src, open(first, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            for dest in rest:
+                try:
+                    os.link(first, dest)
+                except FileExistsError:
+                    # Folders that only differ in case are one folder on Windows/macOS
+                    if not os.path.samefile(first, dest):
+                        shutil.copyfile(first, dest)
+                except OSError as e:
+                    if e.errno not in _LINK_UNSUPPORTED:
+                        raise
+                    shutil.copyfile(first, dest)
+                    
+        def write_json(job):
+            _write_json(*job)
+            
+        # Mostly file I/O and inflate, which release the GIL
+        workers = min(32, (os.cpu_count() or 1) * 4, len(jobs) + len(json_jobs))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                extracted = pool.map(extract, jobs)
+                written = pool.map(write_json, json_jobs)
+                list(extracted)
+                list(written)
+        finally:
+            for zf in handles:
+                zf.close()
+            if src_fd is not None:
+                os.close(src_fd)
+            
     def _sanitize_folder_name(self, name: str) -> str:
         """Convert sprite name to safe folder name"""
-        # Replace // with _ to preserve folder structure info while being filesystem-safe
-        safe_name = name.replace('//', '_')
-        # Remove other unsafe characters
-        safe_name = re.sub(r'[<>:"/\\|?*]', '', safe_name)
-        # Trim and remove trailing dots/spaces
-        safe_name = safe_name.strip('. ')
-        return safe_name if safe_name else 'sprite'
+        return _sanitize_folder_name_cached(name)
     
     def _sanitize_block_id(self, block_id: str) -> str:
         """Convert block ID to safe filename using URL encoding for special chars
@@ -224,20 +504,58 @@ class PMPUnpacker:
             Block ID: "l*"  -> Filename: "child_l%2A.json"
             But the JSON contains: {"l*": {...}} with the original ID
         """
-        safe_id = block_id
-        # URL encode invalid Windows filename characters
-        # CRITICAL: Must encode % first to avoid double-encoding!
-        safe_id = safe_id.replace('%', '%25')  # percent sign (must be first!)
-        safe_id = safe_id.replace('*', '%2A')  # asterisk
-        safe_id = safe_id.replace('?', '%3F')  # question mark
-        safe_id = safe_id.replace('<', '%3C')  # less than
-        safe_id = safe_id.replace('>', '%3E')  # greater than
-        safe_id = safe_id.replace(':', '%3A')  # colon
-        safe_id = safe_id.replace('"', '%22')  # double quote
-        safe_id = safe_id.replace('/', '%2F')  # forward slash
-        safe_id = safe_id.replace('\\', '%5C') # backslash
-        safe_id = safe_id.replace('|', '%7C')  # pipe
-        return safe_id
+        return _sanitize_block_id_cached(block_id)
+        
+    def _make_dir(self, path, log_cb: Optional[Callable] = None):
+        """Create an output folder with a single mkdir, at most once per unpack
+        
+        Sprites whose names sanitize to the same folder share it, so repeats
+        are answered from a set instead of the filesystem. Folders that only
+        differ in case are logged, as they are one folder on Windows or macOS.
+        """
+        path = os.fspath(path)
+        if path in self._created_dirs:
+            return
+        first = self._dir_case_keys.setdefault(path.casefold(), path)
+        if first != path and log_cb:
+            log_cb(LogLevel.WARN, "UNPACKER",
+                   f"'{os.path.basename(first)}' and '{os.path.basename(path)}' only differ in case; "
+                   f"they will overwrite each other on case-insensitive filesystems")
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            if not os.path.isdir(path):
+                raise
+        self._created_dirs.add(path)
+        
+    def _record_target(self, folder_name: str, target_name: str, is_stage: bool):
+        """Note where a target was laid out, for the target_order metadata"""
+        self._target_order.append({
+            'folder': folder_name,
+            'name': target_name,
+            'isStage': is_stage
+        })
+        
+    def _build_project_meta(self, log_cb: Optional[Callable]) -> Dict:
+        """Top-level data for the main project.json of the folder formats (everything but targets)"""
+        data = self.project_data
+        project_meta = {
+            'meta': data.get('meta', {}),
+            'extensions': data.get('extensions', []),
+            'extensionURLs': data.get('extensionURLs', {}),
+            'extensionData': data.get('extensionData', {}),
+            'monitors': data.get('monitors', []),
+            'customFonts': data.get('customFonts', [])  # FIX: Must be in main project.json with full data
+        }
+        
+        # Preserve any unknown top-level keys (in their original order)
+        unknown_keys = [key for key in data if key not in _KNOWN_TOP_KEYS]
+        if unknown_keys:
+            project_meta.update((key, data[key]) for key in unknown_keys)
+            if log_cb:
+                log_cb(LogLevel.DEBUG, "UNPACKER", f"Preserving unknown top-level keys: {', '.join(unknown_keys)}")
+                
+        return project_meta
         
     def _unpack_legacy(
         self,
@@ -256,35 +574,25 @@ class PMPUnpacker:
         if total_progress_cb:
             total_progress_cb(40, "Copying project.json")
             
-        shutil.copy2(
-            self.temp_extract_dir / "project.json",
-            output_path / "project.json"
-        )
+        self._extract_member("project.json", output_path / "project.json")
         
         # Copy all asset files
         if total_progress_cb:
             total_progress_cb(50, "Copying assets")
             
-        assets = [f for f in self.temp_extract_dir.iterdir() 
-                 if f.is_file() and f.name != "project.json"]
+        assets = sorted(name for name in self._root_members if name != "project.json")
                  
         if log_cb:
             log_cb(LogLevel.INFO, "UNPACKER", f"Copying {len(assets)} asset files")
             
-        for idx, asset_file in enumerate(assets):
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
+        for idx, asset_name in enumerate(assets):
             if item_progress_cb:
-                item_progress_cb(int((idx / max(len(assets), 1)) * 100), asset_file.name)
-            
-            dest = output_path / asset_file.name
+                item_progress_cb(int((idx / max(len(assets), 1)) * 100), asset_name)
             
-            # Check if file already exists (shouldn't happen after cleanup)
-            if dest.exists():
-                if log_cb:
-                    log_cb(LogLevel.WARN, "ASSET_MGR", f"Overwriting existing asset: {asset_file.name}")
-            
-            shutil.copy2(asset_file, dest)
-            if log_cb:
-                log_cb(LogLevel.DEBUG, "ASSET_MGR", f"Copied asset: {asset_file.name}")
+            self._queue_extract(asset_name, os.path.join(output_dir, asset_name))
+            if debug_cb:
+                debug_cb(LogLevel.DEBUG, "ASSET_MGR", f"Copied asset: {asset_name}")
                 
         if total_progress_cb:
             total_progress_cb(90, "Legacy format complete")
@@ -309,28 +617,10 @@ class PMPUnpacker:
         if total_progress_cb:
             total_progress_cb(30, "Creating project structure")
             
-        # Get customFonts with full data preservation
-        custom_fonts = self.project_data.get('customFonts', [])
+        project_meta = self._build_project_meta(log_cb)
+        custom_fonts = project_meta['customFonts']
         
-        project_meta = {
-            'meta': self.project_data.get('meta', {}),
-            'extensions': self.project_data.get('extensions', []),
-            'extensionURLs': self.project_data.get('extensionURLs', {}),
-            'extensionData': self.project_data.get('extensionData', {}),
-            'monitors': self.project_data.get('monitors', []),
-            'customFonts': custom_fonts  # FIX: Must be in main project.json with full data
-        }
-        
-        # Preserve any unknown top-level keys
-        for key in self.project_data:
-            if key not in ['meta', 'extensions', 'extensionURLs', 'extensionData', 
-                          'monitors', 'customFonts', 'targets']:
-                project_meta[key] = self.project_data[key]
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "UNPACKER", f"Preserving unknown top-level key: {key}")
-                    
-        with open(output_path / "project.json", 'w', encoding='utf-8') as f:
-            json.dump(project_meta, f, indent=2, ensure_ascii=False)
+        self._queue_json(output_path / "project.json", project_meta)
             
         if log_cb:
             font_details = f"Saved {len(custom_fonts)} custom fonts to project.json"
@@ -351,8 +641,7 @@ class PMPUnpacker:
             'extensions': self.project_data.get('extensions', []),
             'extensionURLs': self.project_data.get('extensionURLs', {})
         }
-        with open(extensions_dir / "index.json", 'w', encoding='utf-8') as f:
-            json.dump(ext_index, f, indent=2, ensure_ascii=False)
+        self._queue_json(extensions_dir / "index.json", ext_index)
             
         # Extract font files to fonts folder
         if total_progress_cb:
@@ -378,12 +667,13 @@ class PMPUnpacker:
             
             # Use "stage" for stage, sanitize name for sprites
             folder_name = "stage" if is_stage else self._sanitize_folder_name(target_name)
+            self._record_target(folder_name, target_name, is_stage)
             
             if log_cb:
                 log_cb(LogLevel.INFO, "UNPACKER", f"Processing {'stage' if is_stage else 'sprite'}: {target_name}")
                 
             target_dir = sprites_dir / folder_name
-            target_dir.mkdir(exist_ok=True)
+            self._make_dir(target_dir, log_cb)
             
             # Process costumes
             self._process_costumes_idea1(target, target_dir, item_progress_cb, log_cb)
@@ -392,25 +682,10 @@ class PMPUnpacker:
             self._process_sounds_idea1(target, target_dir, item_progress_cb, log_cb)
             
             # Create target JSON with all data except costumes/sounds assets
-            target_json = {}
-            for key in target:
-                if key not in ['costumes', 'sounds']:
-                    target_json[key] = target[key]
-                elif key == 'costumes':
-                    # Keep costume metadata but asset files are separate
-                    target_json['costumes'] = [
-                        {k: v for k, v in costume.items()} 
-                        for costume in target.get('costumes', [])
-                    ]
-                elif key == 'sounds':
-                    # Keep sound metadata but asset files are separate
-                    target_json['sounds'] = [
-                        {k: v for k, v in sound.items()} 
-                        for sound in target.get('sounds', [])
-                    ]
-                    
-            with open(target_dir / f"{folder_name}.json", 'w', encoding='utf-8') as f:
-                json.dump(target_json, f, indent=2, ensure_ascii=False)
+            # (costume/sound metadata is kept as-is; the asset files are separate)
+            target_json = dict(target)
+            
+            self._queue_json(target_dir / f"{folder_name}.json", target_json)
                 
         if total_progress_cb:
             total_progress_cb(90, "Idea 1 format complete")
@@ -427,26 +702,20 @@ class PMPUnpacker:
                 log_cb(LogLevel.NOTE, "ASSET_MGR", f"Sprite '{target.get('name', 'unknown')}' has no costumes; skipping folder")
             return
             
-        costumes_dir = target_dir / "costumes"
-        costumes_dir.mkdir(exist_ok=True)
+        # Plain strings: this runs once per costume of every sprite
+        costumes_dir = os.path.join(target_dir, "costumes")
+        self._make_dir(costumes_dir)
         
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
         for costume in costumes:
             md5ext = costume.get('md5ext')
             if not md5ext:
                 continue
                 
-            source = self.temp_extract_dir / md5ext
-            if source.exists():
-                dest = costumes_dir / md5ext
-                
-                # Check if file already exists (shouldn't happen after cleanup)
-                if dest.exists():
-                    if log_cb:
-                        log_cb(LogLevel.WARN, "ASSET_MGR", f"Overwriting existing costume: {md5ext}")
-                
-                shutil.copy2(source, dest)
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "ASSET_MGR", f"Added costume: {md5ext}")
+            if md5ext in self._root_members:
+                self._queue_extract(md5ext, os.path.join(costumes_dir, md5ext))
+                if debug_cb:
+                    debug_cb(LogLevel.DEBUG, "ASSET_MGR", f"Added costume: {md5ext}")
                     
     def _process_sounds_idea1(self, target: Dict, target_dir: Path,
                               item_progress_cb: Optional[Callable],
@@ -458,26 +727,19 @@ class PMPUnpacker:
                 log_cb(LogLevel.NOTE, "ASSET_MGR", f"Sprite '{target.get('name', 'unknown')}' has no sound data; skipping folder.")
             return
             
-        sounds_dir = target_dir / "sounds"
-        sounds_dir.mkdir(exist_ok=True)
+        sounds_dir = os.path.join(target_dir, "sounds")
+        self._make_dir(sounds_dir)
         
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
         for sound in sounds:
             md5ext = sound.get('md5ext')
             if not md5ext:
                 continue
                 
-            source = self.temp_extract_dir / md5ext
-            if source.exists():
-                dest = sounds_dir / md5ext
-                
-                # Check if file already exists (shouldn't happen after cleanup)
-                if dest.exists():
-                    if log_cb:
-                        log_cb(LogLevel.WARN, "ASSET_MGR", f"Overwriting existing sound: {md5ext}")
-                
-                shutil.copy2(source, dest)
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "ASSET_MGR", f"Added sound: {md5ext}")
+            if md5ext in self._root_members:
+                self._queue_extract(md5ext, os.path.join(sounds_dir, md5ext))
+                if debug_cb:
+                    debug_cb(LogLevel.DEBUG, "ASSET_MGR", f"Added sound: {md5ext}")
                     
     def _extract_fonts(self, output_path: Path, log_cb: Optional[Callable]):
         """Extract font files from the archive to fonts folder"""
@@ -488,10 +750,11 @@ class PMPUnpacker:
                 log_cb(LogLevel.DEBUG, "FONTS", "No custom fonts to extract")
             return
             
-        fonts_dir = output_path / "fonts"
-        fonts_dir.mkdir(exist_ok=True)
+        fonts_dir = os.path.join(output_path, "fonts")
+        self._make_dir(fonts_dir)
         
         extracted_count = 0
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
         for font in custom_fonts:
             md5ext = font.get('md5ext')
             if not md5ext:
@@ -499,19 +762,11 @@ class PMPUnpacker:
                     log_cb(LogLevel.WARN, "FONTS", f"Font '{font.get('family', 'unknown')}' has no md5ext")
                 continue
                 
-            source = self.temp_extract_dir / md5ext
-            if source.exists():
-                dest = fonts_dir / md5ext
-                
-                # Check if file already exists (shouldn't happen after cleanup)
-                if dest.exists():
-                    if log_cb:
-                        log_cb(LogLevel.WARN, "FONTS", f"Overwriting existing font: {font.get('family', 'unknown')} ({md5ext})")
-                
-                shutil.copy2(source, dest)
+            if md5ext in self._root_members:
+                self._queue_extract(md5ext, os.path.join(fonts_dir, md5ext))
                 extracted_count += 1
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "FONTS", f"Extracted font: {font.get('family', 'unknown')} ({md5ext})")
+                if debug_cb:
+                    debug_cb(LogLevel.DEBUG, "FONTS", f"Extracted font: {font.get('family', 'unknown')} ({md5ext})")
             else:
                 if log_cb:
                     log_cb(LogLevel.WARN, "FONTS", f"Font file not found: {md5ext} for font '{font.get('family', 'unknown')}'")
@@ -531,25 +786,9 @@ class PMPUnpacker:
         if total_progress_cb:
             total_progress_cb(30, "Creating project structure")
             
-        project_meta = {
-            'meta': self.project_data.get('meta', {}),
-            'extensions': self.project_data.get('extensions', []),
-            'extensionURLs': self.project_data.get('extensionURLs', {}),
-            'extensionData': self.project_data.get('extensionData', {}),
-            'monitors': self.project_data.get('monitors', []),
-            'customFonts': self.project_data.get('customFonts', [])
-        }
+        project_meta = self._build_project_meta(log_cb)
         
-        # Preserve unknown top-level keys
-        for key in self.project_data:
-            if key not in ['meta', 'extensions', 'extensionURLs', 'extensionData', 
-                          'monitors', 'customFonts', 'targets']:
-                project_meta[key] = self.project_data[key]
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "UNPACKER", f"Preserving unknown top-level key: {key}")
-                    
-        with open(output_path / "project.json", 'w', encoding='utf-8') as f:
-            json.dump(project_meta, f, indent=2, ensure_ascii=False)
+        self._queue_json(output_path / "project.json", project_meta)
             
         if log_cb:
             log_cb(LogLevel.DEBUG, "FONTS", f"Saved {len(project_meta.get('customFonts', []))} custom fonts to project.json")
@@ -565,8 +804,7 @@ class PMPUnpacker:
             'extensions': self.project_data.get('extensions', []),
             'extensionURLs': self.project_data.get('extensionURLs', {})
         }
-        with open(extensions_dir / "index.json", 'w', encoding='utf-8') as f:
-            json.dump(ext_index, f, indent=2, ensure_ascii=False)
+        self._queue_json(extensions_dir / "index.json", ext_index)
             
         # Extract font files to fonts folder
         if total_progress_cb:
@@ -589,12 +827,13 @@ class PMPUnpacker:
             target_name = target.get('name', f'target_{idx}')
             is_stage = target.get('isStage', False)
             folder_name = "stage" if is_stage else self._sanitize_folder_name(target_name)
+            self._record_target(folder_name, target_name, is_stage)
             
             if log_cb:
                 log_cb(LogLevel.INFO, "UNPACKER", f"Processing {'stage' if is_stage else 'sprite'}: {target_name}")
                 
             target_dir = sprites_dir / folder_name
-            target_dir.mkdir(exist_ok=True)
+            self._make_dir(target_dir, log_cb)
             
             # Process costumes and sounds (same as Idea 1)
             self._process_costumes_idea1(target, target_dir, item_progress_cb, log_cb)
@@ -604,23 +843,9 @@ class PMPUnpacker:
             self._process_blocks_idea2(target, target_dir, log_cb)
             
             # Create target JSON without blocks (they're in code/)
-            target_json = {}
-            for key in target:
-                if key not in ['costumes', 'sounds', 'blocks']:
-                    target_json[key] = target[key]
-                elif key == 'costumes':
-                    target_json['costumes'] = [
-                        {k: v for k, v in costume.items()} 
-                        for costume in target.get('costumes', [])
-                    ]
-                elif key == 'sounds':
-                    target_json['sounds'] = [
-                        {k: v for k, v in sound.items()} 
-                        for sound in target.get('sounds', [])
-                    ]
-                    
-            with open(target_dir / f"{folder_name}.json", 'w', encoding='utf-8') as f:
-                json.dump(target_json, f, indent=2, ensure_ascii=False)
+            target_json = {key: value for key, value in target.items() if key != 'blocks'}
+            
+            self._queue_json(target_dir / f"{folder_name}.json", target_json)
                 
         if total_progress_cb:
             total_progress_cb(90, "Idea 2 format complete")
@@ -643,30 +868,29 @@ class PMPUnpacker:
             return
             
         code_dir = target_dir / "code"
-        code_dir.mkdir(exist_ok=True)
+        self._make_dir(code_dir)
         
         # Track all blocks that will be written in stacks
         blocks_in_stacks = set()
         
         # Find all top-level blocks (only dict blocks can have topLevel property)
-        top_level_blocks = []
-        for block_id, block_data in blocks.items():
-            # Only dict blocks can be top-level (need topLevel property)
-            if not isinstance(block_data, dict):
-                # Non-dict blocks will be preserved later
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "UNPACKER", f"Non-dict block {block_id} (type: {type(block_data).__name__}) - will preserve as detached")
-                continue
-            if block_data.get('topLevel', False):
-                top_level_blocks.append(block_id)
-                
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
+        top_level_blocks = [
+            block_id for block_id, block_data in blocks.items()
+            if isinstance(block_data, dict) and block_data.get('topLevel', False)
+        ]
+        if debug_cb:
+            # Non-dict blocks will be preserved later
+            for block_id, block_data in blocks.items():
+                if not isinstance(block_data, dict):
+                    debug_cb(LogLevel.DEBUG, "UNPACKER", f"Non-dict block {block_id} (type: {type(block_data).__name__}) - will preserve as detached")
+                    
         # Create index of top-level blocks
         index_data = {
             'topLevelBlocks': top_level_blocks,
             'totalBlocks': len(blocks)
         }
-        with open(code_dir / "index.json", 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        self._queue_json(code_dir / "index.json", index_data)
             
         if log_cb:
             log_cb(LogLevel.DEBUG, "UNPACKER", f"Found {len(top_level_blocks)} top-level blocks in {len(blocks)} total blocks")
@@ -681,84 +905,72 @@ class PMPUnpacker:
             # Write this stack to a file
             # Use sanitized version of block ID for filename
             sanitized_id = self._sanitize_block_id(top_block_id)
-            # Use first 2 chars for filename (after sanitization)
-            short_id = sanitized_id[:2] if len(sanitized_id) >= 2 else sanitized_id
-            block_file = code_dir / f"block-{short_id}.json"
+            # Use the first chars for the filename (after sanitization)
+            short_id = sanitized_id[:_SHORT_ID_LENGTH]
+            # If the name is taken, append a number
+            block_file = self._unused_path(code_dir, f"block-{short_id}", ".json")
             
-            # If file exists, append a number
-            counter = 1
-            while block_file.exists():
-                block_file = code_dir / f"block-{short_id}_{counter}.json"
-                counter += 1
+            self._queue_json(block_file, stack_blocks)
                 
-            with open(block_file, 'w', encoding='utf-8') as f:
-                json.dump(stack_blocks, f, indent=2, ensure_ascii=False)
-                
-            if log_cb:
-                log_cb(LogLevel.DEBUG, "UNPACKER", f"Wrote {len(stack_blocks)} blocks to {block_file.name}")
+            if debug_cb:
+                debug_cb(LogLevel.DEBUG, "UNPACKER", f"Wrote {len(stack_blocks)} blocks to {os.path.basename(block_file)}")
                 
         # CRITICAL FIX: Preserve detached/orphan blocks (including non-dict ones)
-        detached_blocks = {}
-        for block_id, block_data in blocks.items():
-            if block_id not in blocks_in_stacks:
-                detached_blocks[block_id] = block_data
+        # (blocks_in_stacks only holds IDs from blocks, so equal sizes mean none;
+        # the comprehension keeps the project's block order, a set difference wouldn't)
+        if len(blocks_in_stacks) == len(blocks):
+            detached_blocks = {}
+        elif not blocks_in_stacks:
+            detached_blocks = blocks  # No stacks: every block is detached, no need to copy
+        else:
+            detached_blocks = {
+                block_id: block_data for block_id, block_data in blocks.items()
+                if block_id not in blocks_in_stacks
+            }
                 
         if detached_blocks:
             detached_file = code_dir / "detached_blocks.json"
-            with open(detached_file, 'w', encoding='utf-8') as f:
-                json.dump(detached_blocks, f, indent=2, ensure_ascii=False)
+            self._queue_json(detached_file, detached_blocks)
             if log_cb:
                 log_cb(LogLevel.DEBUG, "UNPACKER", f"Preserved {len(detached_blocks)} detached/non-dict blocks in {detached_file.name}")
                 
                 
     def _collect_block_stack(self, all_blocks: Dict, start_block_id: str) -> Dict:
         """Collect a top-level block and all its children recursively"""
-        collected = {}
-        to_process = [start_block_id]
-        processed = set()
+        collected = {}  # Also the visited set
+        to_process = deque([start_block_id])
         
         while to_process:
-            block_id = to_process.pop(0)
-            if block_id in processed or block_id not in all_blocks:
+            block_id = to_process.popleft()
+            if block_id in collected or block_id not in all_blocks:
                 continue
                 
-            processed.add(block_id)
             block_data = all_blocks[block_id]
             
             # CRITICAL FIX: Preserve ALL blocks regardless of type (custom extensions)
             # Non-dict blocks are stored as-is (opaque preservation)
+            collected[block_id] = block_data
             if not isinstance(block_data, dict):
-                # Preserve non-dict block opaquely
-                collected[block_id] = block_data
                 continue
                 
-            collected[block_id] = block_data
-            
             # Add next block
             next_id = block_data.get('next')
             if next_id and isinstance(next_id, str):
                 to_process.append(next_id)
                 
             # Add inputs (recursively check for block references)
+            # This covers SUBSTACK/SUBSTACK2 of C-shaped blocks too
             inputs = block_data.get('inputs', {})
             if not isinstance(inputs, dict):
                 continue
                 
-            for input_name, input_data in inputs.items():
+            for input_data in inputs.values():
                 if isinstance(input_data, list) and len(input_data) >= 2:
                     # Input format is [type, value] or [type, value, ...]
                     # If value is a string, it might be a block ID
                     if isinstance(input_data[1], str) and input_data[1] in all_blocks:
                         to_process.append(input_data[1])
                         
-            # Add substack inputs (for C-shaped blocks)
-            if 'SUBSTACK' in inputs and isinstance(inputs['SUBSTACK'], list):
-                if len(inputs['SUBSTACK']) >= 2 and isinstance(inputs['SUBSTACK'][1], str):
-                    to_process.append(inputs['SUBSTACK'][1])
-            if 'SUBSTACK2' in inputs and isinstance(inputs['SUBSTACK2'], list):
-                if len(inputs['SUBSTACK2']) >= 2 and isinstance(inputs['SUBSTACK2'][1], str):
-                    to_process.append(inputs['SUBSTACK2'][1])
-                    
         return collected
         
     def _unpack_hidden(self, output_dir: str, total_progress_cb: Optional[Callable],
@@ -773,25 +985,9 @@ class PMPUnpacker:
         if total_progress_cb:
             total_progress_cb(30, "Creating project structure")
             
-        project_meta = {
-            'meta': self.project_data.get('meta', {}),
-            'extensions': self.project_data.get('extensions', []),
-            'extensionURLs': self.project_data.get('extensionURLs', {}),
-            'extensionData': self.project_data.get('extensionData', {}),
-            'monitors': self.project_data.get('monitors', []),
-            'customFonts': self.project_data.get('customFonts', [])
-        }
+        project_meta = self._build_project_meta(log_cb)
         
-        # Preserve unknown top-level keys
-        for key in self.project_data:
-            if key not in ['meta', 'extensions', 'extensionURLs', 'extensionData', 
-                          'monitors', 'customFonts', 'targets']:
-                project_meta[key] = self.project_data[key]
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "UNPACKER", f"Preserving unknown top-level key: {key}")
-                    
-        with open(output_path / "project.json", 'w', encoding='utf-8') as f:
-            json.dump(project_meta, f, indent=2, ensure_ascii=False)
+        self._queue_json(output_path / "project.json", project_meta)
             
         if log_cb:
             log_cb(LogLevel.DEBUG, "FONTS", f"Saved {len(project_meta.get('customFonts', []))} custom fonts to project.json")
@@ -807,8 +1003,7 @@ class PMPUnpacker:
             'extensions': self.project_data.get('extensions', []),
             'extensionURLs': self.project_data.get('extensionURLs', {})
         }
-        with open(extensions_dir / "index.json", 'w', encoding='utf-8') as f:
-            json.dump(ext_index, f, indent=2, ensure_ascii=False)
+        self._queue_json(extensions_dir / "index.json", ext_index)
             
         # Extract font files to fonts folder
         if total_progress_cb:
@@ -831,12 +1026,13 @@ class PMPUnpacker:
             target_name = target.get('name', f'target_{idx}')
             is_stage = target.get('isStage', False)
             folder_name = "stage" if is_stage else self._sanitize_folder_name(target_name)
+            self._record_target(folder_name, target_name, is_stage)
             
             if log_cb:
                 log_cb(LogLevel.INFO, "UNPACKER", f"Processing {'stage' if is_stage else 'sprite'}: {target_name}")
                 
             target_dir = sprites_dir / folder_name
-            target_dir.mkdir(exist_ok=True)
+            self._make_dir(target_dir, log_cb)
             
             # Process costumes and sounds (same as Idea 1)
             self._process_costumes_idea1(target, target_dir, item_progress_cb, log_cb)
@@ -846,23 +1042,9 @@ class PMPUnpacker:
             self._process_blocks_hidden(target, target_dir, log_cb)
             
             # Create target JSON without blocks (they're in code/)
-            target_json = {}
-            for key in target:
-                if key not in ['costumes', 'sounds', 'blocks']:
-                    target_json[key] = target[key]
-                elif key == 'costumes':
-                    target_json['costumes'] = [
-                        {k: v for k, v in costume.items()} 
-                        for costume in target.get('costumes', [])
-                    ]
-                elif key == 'sounds':
-                    target_json['sounds'] = [
-                        {k: v for k, v in sound.items()} 
-                        for sound in target.get('sounds', [])
-                    ]
-                    
-            with open(target_dir / f"{folder_name}.json", 'w', encoding='utf-8') as f:
-                json.dump(target_json, f, indent=2, ensure_ascii=False)
+            target_json = {key: value for key, value in target.items() if key != 'blocks'}
+            
+            self._queue_json(target_dir / f"{folder_name}.json", target_json)
                 
         if total_progress_cb:
             total_progress_cb(90, "Hidden format complete")
@@ -885,30 +1067,29 @@ class PMPUnpacker:
             return
             
         code_dir = target_dir / "code"
-        code_dir.mkdir(exist_ok=True)
+        self._make_dir(code_dir)
         
         # Track all blocks that will be written in stacks
         blocks_in_stacks = set()
         
         # Find all top-level blocks (only dict blocks can have topLevel property)
-        top_level_blocks = []
-        for block_id, block_data in blocks.items():
-            # Only dict blocks can be top-level (need topLevel property)
-            if not isinstance(block_data, dict):
-                # Non-dict blocks will be preserved later
-                if log_cb:
-                    log_cb(LogLevel.DEBUG, "UNPACKER", f"Non-dict block {block_id} (type: {type(block_data).__name__}) - will preserve as detached")
-                continue
-            if block_data.get('topLevel', False):
-                top_level_blocks.append(block_id)
-                
+        debug_cb = log_cb if level_enabled(log_cb, LogLevel.DEBUG) else None
+        top_level_blocks = [
+            block_id for block_id, block_data in blocks.items()
+            if isinstance(block_data, dict) and block_data.get('topLevel', False)
+        ]
+        if debug_cb:
+            # Non-dict blocks will be preserved later
+            for block_id, block_data in blocks.items():
+                if not isinstance(block_data, dict):
+                    debug_cb(LogLevel.DEBUG, "UNPACKER", f"Non-dict block {block_id} (type: {type(block_data).__name__}) - will preserve as detached")
+                    
         # Create main index
         index_data = {
             'topLevelBlocks': top_level_blocks,
             'totalBlocks': len(blocks)
         }
-        with open(code_dir / "index.json", 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        self._queue_json(code_dir / "index.json", index_data)
             
         if log_cb:
             log_cb(LogLevel.DEBUG, "UNPACKER", f"Found {len(top_level_blocks)} top-level blocks in {len(blocks)} total blocks")
@@ -923,21 +1104,14 @@ class PMPUnpacker:
             
             # Create folder for this parent using sanitized ID
             sanitized_id = self._sanitize_block_id(top_block_id)
-            short_id = sanitized_id[:2] if len(sanitized_id) >= 2 else sanitized_id
-            parent_dir = code_dir / f"parent_{short_id}"
-            
+            short_id = sanitized_id[:_SHORT_ID_LENGTH]
             # Handle name collisions
-            counter = 1
-            while parent_dir.exists():
-                parent_dir = code_dir / f"parent_{short_id}_{counter}"
-                counter += 1
-                
-            parent_dir.mkdir(exist_ok=True)
+            parent_dir = self._unused_path(code_dir, f"parent_{short_id}")
+            self._make_dir(parent_dir)
             
             # Write parent block
             parent_data = {top_block_id: stack_blocks[top_block_id]}
-            with open(parent_dir / f"parent_{short_id}.json", 'w', encoding='utf-8') as f:
-                json.dump(parent_data, f, indent=2, ensure_ascii=False)
+            self._queue_json(os.path.join(parent_dir, f"parent_{short_id}.json"), parent_data)
                 
             # Write children blocks
             children_ids = [bid for bid in stack_blocks.keys() if bid != top_block_id]
@@ -947,38 +1121,43 @@ class PMPUnpacker:
                 'parentBlock': top_block_id,
                 'children': children_ids
             }
-            with open(parent_dir / "index.json", 'w', encoding='utf-8') as f:
-                json.dump(child_index, f, indent=2, ensure_ascii=False)
-                
-            # Write each child block with sanitized filename
-            for child_id in children_ids:
-                sanitized_child_id = self._sanitize_block_id(child_id)
-                child_short = sanitized_child_id[:2] if len(sanitized_child_id) >= 2 else sanitized_child_id
-                child_file = parent_dir / f"child_{child_short}.json"
-                
-                # Handle collisions
-                counter = 1
-                while child_file.exists():
-                    child_file = parent_dir / f"child_{child_short}_{counter}.json"
-                    counter += 1
+            self._queue_json(os.path.join(parent_dir, "index.json"), child_index)
+                
+            if self.pack_hidden_children:
+                # All children of the stack in one file
+                if children_ids:
+                    children_data = {child_id: stack_blocks[child_id] for child_id in children_ids}
+                    self._queue_json(os.path.join(parent_dir, "children.json"), children_data)
+            else:
+                # Write each child block with sanitized filename
+                for child_id in children_ids:
+                    sanitized_child_id = self._sanitize_block_id(child_id)
+                    child_short = sanitized_child_id[:_SHORT_ID_LENGTH]
+                    # Handle collisions
+                    child_file = self._unused_path(parent_dir, f"child_{child_short}", ".json")
                     
-                child_data = {child_id: stack_blocks[child_id]}
-                with open(child_file, 'w', encoding='utf-8') as f:
-                    json.dump(child_data, f, indent=2, ensure_ascii=False)
+                    child_data = {child_id: stack_blocks[child_id]}
+                    self._queue_json(child_file, child_data)
                     
-            if log_cb:
-                log_cb(LogLevel.DEBUG, "UNPACKER", f"Wrote parent with {len(children_ids)} children to {parent_dir.name}")
+            if debug_cb:
+                debug_cb(LogLevel.DEBUG, "UNPACKER", f"Wrote parent with {len(children_ids)} children to {os.path.basename(parent_dir)}")
                 
         # CRITICAL FIX: Preserve detached/orphan blocks (including non-dict ones)
-        detached_blocks = {}
-        for block_id, block_data in blocks.items():
-            if block_id not in blocks_in_stacks:
-                detached_blocks[block_id] = block_data
+        # (blocks_in_stacks only holds IDs from blocks, so equal sizes mean none;
+        # the comprehension keeps the project's block order, a set difference wouldn't)
+        if len(blocks_in_stacks) == len(blocks):
+            detached_blocks = {}
+        elif not blocks_in_stacks:
+            detached_blocks = blocks  # No stacks: every block is detached, no need to copy
+        else:
+            detached_blocks = {
+                block_id: block_data for block_id, block_data in blocks.items()
+                if block_id not in blocks_in_stacks
+            }
                 
         if detached_blocks:
             detached_file = code_dir / "detached_blocks.json"
-            with open(detached_file, 'w', encoding='utf-8') as f:
-                json.dump(detached_blocks, f, indent=2, ensure_ascii=False)
+            self._queue_json(detached_file, detached_blocks)
             if log_cb:
                 log_cb(LogLevel.DEBUG, "UNPACKER", f"Preserved {len(detached_blocks)} detached/non-dict blocks in {detached_file.name}")
 
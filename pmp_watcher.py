@@ -0,0 +1,139 @@
+"""
+PenguinMod File Converter - Folder Watcher
+Reports changes in an unpacked project folder (requires the optional watchdog package)
+"""
+
+import os
+import sys
+from typing import Callable, Iterable
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    PollingObserver = None
+    FileSystemEventHandler = object
+
+
+# Files that make up an unpacked project; everything else is ignored
+WATCHED_SUFFIXES = frozenset({
+    '.json',
+    '.svg', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp',
+    '.wav', '.mp3', '.ogg', '.flac',
+    '.ttf', '.otf', '.woff', '.woff2',
+})
+
+# Filesystems where native change notifications are unreliable
+NETWORK_FS_TYPES = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', '9p', 'afs', 'ncpfs',
+    'fuse.sshfs', 'glusterfs', 'ceph',
+})
+
+
+def watchdog_available() -> bool:
+    """Check whether the watchdog package is installed"""
+    return Observer is not None
+
+
+def is_network_path(path: str) -> bool:
+    """Best-effort check for folders on a network share"""
+    path = os.path.abspath(path)
+    
+    if sys.platform == 'win32':
+        if path.startswith('\\\\'):
+            return True
+        try:
+            import ctypes
+            DRIVE_REMOTE = 4
+            drive = os.path.splitdrive(path)[0] + '\\'
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+        except Exception:
+            return False
+            
+    if sys.platform.startswith('linux'):
+        # The longest mount point containing the path decides
+        best_mount = ''
+        best_type = ''
+        try:
+            with open('/proc/mounts', 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) < 3:
+                        continue
+                    mount = parts[1].replace('\\040', ' ')
+                    if len(mount) <= len(best_mount):
+                        continue
+                    if path == mount or path.startswith(mount.rstrip('/') + '/'):
+                        best_mount = mount
+                        best_type = parts[2]
+        except OSError:
+            return False
+        return best_type in NETWORK_FS_TYPES
+        
+    return False
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forwards relevant file events to a callback"""
+    
+    def __init__(self, on_change: Callable[[], None], ignore: Iterable[str]):
+        super().__init__()
+        self.on_change = on_change
+        self.ignore = tuple(os.path.abspath(p) for p in ignore if p)
+        # Match whole path components, so ignoring /x/proj leaves /x/project alone
+        self._ignore_prefixes = tuple(p.rstrip(os.sep) + os.sep for p in self.ignore)
+        
+    def _is_relevant(self, path) -> bool:
+        path = os.fsdecode(path)
+        full = os.path.abspath(path)
+        if full in self.ignore or full.startswith(self._ignore_prefixes):
+            return False
+        return os.path.splitext(path)[1].lower() in WATCHED_SUFFIXES
+        
+    def on_any_event(self, event):
+        if event.event_type not in ('created', 'modified', 'moved', 'deleted'):
+            return
+        if event.is_directory:
+            # Files inside new folders raise their own events
+            relevant = event.event_type in ('moved', 'deleted')
+        else:
+            relevant = self._is_relevant(event.src_path) or (
+                event.event_type == 'moved' and self._is_relevant(event.dest_path)
+            )
+        if relevant:
+            self.on_change()
+
+
+class FolderWatcher:
+    """Watches a folder tree and calls on_change (from a watcher thread) when it changes"""
+    
+    def __init__(
+        self,
+        folder: str,
+        on_change: Callable[[], None],
+        ignore: Iterable[str] = (),
+        interval: float = 30
+    ):
+        self.folder = folder
+        self.on_change = on_change
+        self.ignore = ignore
+        self.interval = interval  # Seconds between scans when polling
+        self.polling = False
+        self._observer = None
+        
+    def start(self):
+        """Start watching; uses polling for network shares"""
+        self.polling = is_network_path(self.folder)
+        observer = PollingObserver(timeout=self.interval) if self.polling else Observer()
+        observer.schedule(_ChangeHandler(self.on_change, self.ignore), self.folder, recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        
+    def stop(self):
+        """Stop watching (does not wait for the observer thread)"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
@@ -5,7 +5,6 @@ Simple launcher script with error handling
 """
 
 import sys
-import subprocess
 from pathlib import Path
 
 def check_python_version():